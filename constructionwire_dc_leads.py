@@ -154,9 +154,12 @@ async def scrape_detail_page(page, detail_url: str) -> dict:
         return {}
     await page.goto(detail_url, wait_until="domcontentloaded")
     try:
-        await page.wait_for_load_state("networkidle", timeout=6000)
+        # 等详情页主体出现即可；CW 有长轮询 XHR，networkidle 基本不会触发
+        await page.wait_for_selector(
+            "tbody.schedule, tbody.contact-info, div.report-heading", timeout=6000
+        )
     except Exception:
-        pass  # CW long-polls XHRs — networkidle is unreliable; downstream selectors handle real readiness
+        pass  # downstream _safe_text lookups tolerate a partially rendered page
 
     data = {}
     # 标题
@@ -51,11 +51,11 @@ async def wait_for_login_success(page, timeout_ms: int = 300_000):
       2. Wait for URL to leave /Login (i.e. user finished login).
     Avoids the about:blank false-positive from the original loose `'/Login' not in url` check.
     """
-    deadline = asyncio.get_event_loop().time() + (timeout_ms / 1000.0)
+    deadline = asyncio.get_running_loop().time() + (timeout_ms / 1000.0)
 
     # Stage 1: confirm landing
     landed_on_login = False
-    while asyncio.get_event_loop().time() < deadline:
+    while asyncio.get_running_loop().time() < deadline:
         url = page.url
         if _on_login_page(url):
             landed_on_login = True
@@ -72,7 +72,7 @@ async def wait_for_login_success(page, timeout_ms: int = 300_000):
     print(f"已到达登录页 ({page.url})。请在浏览器中手动登录,登录后窗口会自动关闭并保存 cookies…")
 
     # Stage 2: wait for URL to leave /Login
-    while asyncio.get_event_loop().time() < deadline:
+    while asyncio.get_running_loop().time() < deadline:
         url = page.url
         if _on_app_page(url):
             print(f"检测到登录成功,跳转到 {url}")
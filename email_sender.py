@@ -6,6 +6,9 @@ Signature adapts to the sending address automatically.
 import base64
 import os
 import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from email.mime.image import MIMEImage
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -116,13 +119,14 @@ def _build_html_message(
     brand: dict = BCC_BRAND,
     in_reply_to: str | None = None,
     references: str | None = None,
+    prebuilt_parts: list[MIMEBase] | None = None,
 ) -> MIMEMultipart:
     """
     Build a multipart/related HTML email with:
       - Plain text fallback
       - HTML body with brand-specific signature block
       - Inline brand logo (cid per brand)
-      - Optional PDF attachment
+      - Optional PDF attachment (paths, or parts already built by build_attachment_part)
       - Optional threading headers (In-Reply-To, References) for proper reply chain
     """
     # Outer container: related (holds html + inline image)
@@ -177,17 +181,97 @@ def _build_html_message(
         all_attachments.append(attachment_path)
     for apath in all_attachments:
         if os.path.isfile(apath):
-            filename = os.path.basename(apath)
-            with open(apath, "rb") as f:
-                part = MIMEBase("application", "octet-stream")
-                part.set_payload(f.read())
-            encoders.encode_base64(part)
-            part.add_header("Content-Disposition", f'attachment; filename="{filename}"')
-            outer.attach(part)
+            outer.attach(build_attachment_part(apath))
+    for part in prebuilt_parts or []:
+        outer.attach(part)
 
     return outer
 
 
+def build_attachment_part(attachment_path: str) -> MIMEBase:
+    """Read + base64-encode a file attachment once. The part can be attached to many messages."""
+    filename = os.path.basename(attachment_path)
+    with open(attachment_path, "rb") as f:
+        part = MIMEBase("application", "octet-stream")
+        part.set_payload(f.read())
+    encoders.encode_base64(part)
+    part.add_header("Content-Disposition", f'attachment; filename="{filename}"')
+    return part
+
+
+class SMTPSession:
+    """
+    One logged-in SMTP connection reused across several sends (saves the
+    STARTTLS + AUTH round-trips per email). Connects lazily on first send and
+    reconnects if a NOOP shows the server has dropped the idle connection. A
+    failure once sendmail has started is raised, never resent: the server may
+    already have accepted the message.
+    """
+
+    def __init__(
+        self,
+        user_env: str = "PRIV_MAIL1_USER",
+        pass_env: str = "PRIV_MAIL1_PASS",
+        host_env: str = "PRIV_MAIL1_SMTP",
+        host_default: str = "smtp.privateemail.com",
+    ):
+        self.user_env = user_env
+        self.pass_env = pass_env
+        self.host_env = host_env
+        self.host_default = host_default
+        self._server: smtplib.SMTP | None = None
+
+    def _connect(self) -> smtplib.SMTP:
+        user     = os.environ.get(self.user_env, "").strip().strip('"')
+        password = os.environ.get(self.pass_env, "").strip().strip('"')
+        host     = os.environ.get(self.host_env, self.host_default).strip().strip('"')
+        server = smtplib.SMTP(host, 587)
+        try:
+            server.starttls()
+            server.login(user, password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def sendmail(self, from_addr: str, recipients: list[str], msg_str: str) -> None:
+        if self._server is not None:
+            try:
+                alive = self._server.noop()[0] == 250
+            except (smtplib.SMTPException, OSError):
+                alive = False
+            if not alive:
+                self._server.close()
+                self._server = None
+        if self._server is None:
+            self._server = self._connect()
+        try:
+            self._server.sendmail(from_addr, recipients, msg_str)
+        except smtplib.SMTPServerDisconnected:
+            # Don't resend: drop the dead connection so the next send reconnects
+            self._server.close()
+            self._server = None
+            raise
+
+    def close(self) -> None:
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                self._server.close()
+            self._server = None
+
+
+@contextmanager
+def admin_smtp_session():
+    """Reusable admin@ (PRIV_MAIL1_*) SMTP connection: pass as session= to send_from_admin*."""
+    session = SMTPSession()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
 def _smtp_send(
     msg: MIMEMultipart,
     from_addr: str,
@@ -196,17 +280,23 @@ def _smtp_send(
     pass_env: str = "PRIV_MAIL1_PASS",
     host_env: str = "PRIV_MAIL1_SMTP",
     host_default: str = "smtp.privateemail.com",
+    session: SMTPSession | None = None,
 ) -> tuple[bool, str]:
+    if session is not None:
+        user_env, pass_env = session.user_env, session.pass_env
     user     = os.environ.get(user_env, "").strip().strip('"')
     password = os.environ.get(pass_env, "").strip().strip('"')
     host     = os.environ.get(host_env, host_default).strip().strip('"')
     if not user or not password:
         return False, f"Missing {user_env} / {pass_env} in .env"
     try:
-        with smtplib.SMTP(host, 587) as server:
-            server.starttls()
-            server.login(user, password)
-            server.sendmail(from_addr, recipients, msg.as_string())
+        if session is not None:
+            session.sendmail(from_addr, recipients, msg.as_string())
+        else:
+            with smtplib.SMTP(host, 587) as server:
+                server.starttls()
+                server.login(user, password)
+                server.sendmail(from_addr, recipients, msg.as_string())
         return True, f"Sent from {from_addr} to {recipients[0]}, CC {', '.join(recipients[1:])}"
     except smtplib.SMTPAuthenticationError as e:
         return False, f"SMTP auth failed: {e}"
@@ -219,9 +309,11 @@ def _smtp_send(
 def send_from_admin(
     to_email: str, subject: str, body_plain: str, cc: str | None = None,
     in_reply_to: str | None = None, references: str | None = None,
+    session: SMTPSession | None = None,
 ) -> tuple[bool, str]:
     """Send HTML email from admin@ with inline logo + signature. CC ycao@ automatically.
-    Pass in_reply_to / references to thread the message under an existing conversation."""
+    Pass in_reply_to / references to thread the message under an existing conversation.
+    Pass session (from admin_smtp_session()) to reuse one SMTP connection across a batch."""
     cc_list = [CC_YCAO]
     if cc:
         for e in cc.replace(",", " ").split():
@@ -231,16 +323,47 @@ def send_from_admin(
 
     msg = _build_html_message(ADMIN_FROM, to_email, subject, body_plain, cc_list,
                               in_reply_to=in_reply_to, references=references)
-    return _smtp_send(msg, ADMIN_FROM, [to_email] + cc_list)
+    return _smtp_send(msg, ADMIN_FROM, [to_email] + cc_list, session=session)
+
+
+def send_from_admin_batch(
+    items: list[tuple[str, str, str]], workers: int = 1,
+) -> list[tuple[bool, str]]:
+    """Send several (to_email, subject, body_plain) emails from admin@.
+    workers=1 sends over one SMTP connection; workers>1 runs that many threads,
+    each with its own logged-in connection. Returns one (ok, msg) per item, in order."""
+    if workers <= 1 or len(items) <= 1:
+        with admin_smtp_session() as session:
+            return [send_from_admin(to, subject, body, session=session) for to, subject, body in items]
+
+    _local = threading.local()
+    sessions: list[SMTPSession] = []
+
+    def _send(item: tuple[str, str, str]) -> tuple[bool, str]:
+        smtp = getattr(_local, "smtp", None)
+        if smtp is None:
+            smtp = _local.smtp = SMTPSession()
+            sessions.append(smtp)
+        to, subject, body = item
+        return send_from_admin(to, subject, body, session=smtp)
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+            return list(pool.map(_send, items))
+    finally:
+        for smtp in sessions:
+            smtp.close()
 
 
 def send_from_admin_with_attachment(
     to_email: str, subject: str, body_plain: str, attachment_path: str,
     cc: str | None = None,
     in_reply_to: str | None = None, references: str | None = None,
+    session: SMTPSession | None = None,
 ) -> tuple[bool, str]:
     """Send HTML email from admin@ with PDF attachment + inline logo + signature.
-    Pass in_reply_to / references to thread the message under an existing conversation."""
+    Pass in_reply_to / references to thread the message under an existing conversation.
+    Pass session (from admin_smtp_session()) to reuse one SMTP connection across a batch."""
     if not os.path.isfile(attachment_path):
         return False, f"Attachment not found: {attachment_path}"
 
@@ -253,7 +376,26 @@ def send_from_admin_with_attachment(
 
     msg = _build_html_message(ADMIN_FROM, to_email, subject, body_plain, cc_list, attachment_path,
                               in_reply_to=in_reply_to, references=references)
-    return _smtp_send(msg, ADMIN_FROM, [to_email] + cc_list)
+    return _smtp_send(msg, ADMIN_FROM, [to_email] + cc_list, session=session)
+
+
+def send_from_admin_with_prebuilt_attachment(
+    to_email: str, subject: str, body_plain: str, attachment_part: MIMEBase,
+    cc: str | None = None,
+    session: SMTPSession | None = None,
+) -> tuple[bool, str]:
+    """Like send_from_admin_with_attachment, but takes a part from build_attachment_part()
+    so a batch sending the same PDF reads and encodes it only once."""
+    cc_list = [CC_YCAO]
+    if cc:
+        for e in cc.replace(",", " ").split():
+            e = e.strip()
+            if e and e not in (CC_YCAO, to_email):
+                cc_list.append(e)
+
+    msg = _build_html_message(ADMIN_FROM, to_email, subject, body_plain, cc_list,
+                              prebuilt_parts=[attachment_part])
+    return _smtp_send(msg, ADMIN_FROM, [to_email] + cc_list, session=session)
 
 
 def send_from_ycao(
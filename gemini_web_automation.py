@@ -135,10 +135,10 @@ async def _wait_for_thinking_done(page: Page, timeout_ms: int) -> bool:
     等待“Thinking”/“Searching”等加载状态消失，或超时。
     通过轮询页面文本是否仍包含这些关键词实现，避免依赖固定 class。
     """
-    deadline = asyncio.get_event_loop().time() + (timeout_ms / 1000.0)
+    deadline = asyncio.get_running_loop().time() + (timeout_ms / 1000.0)
     last_len = 0
     stable_rounds = 0
-    while asyncio.get_event_loop().time() < deadline:
+    while asyncio.get_running_loop().time() < deadline:
         try:
             body = await page.locator("body").inner_text()
             lower = body.lower()
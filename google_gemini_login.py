@@ -35,8 +35,8 @@ async def wait_for_gemini_ready(page, timeout_ms: int = 300_000):
     轮询直到：URL 为 gemini.google.com 且已离开 accounts（登录完成）。
     超时则抛出 asyncio.TimeoutError。
     """
-    deadline = asyncio.get_event_loop().time() + (timeout_ms / 1000.0)
-    while asyncio.get_event_loop().time() < deadline:
+    deadline = asyncio.get_running_loop().time() + (timeout_ms / 1000.0)
+    while asyncio.get_running_loop().time() < deadline:
         if is_on_gemini_ready(page.url):
             return True
         await asyncio.sleep(1.0)
@@ -26,8 +26,8 @@ def is_on_gemini_ready(url: str) -> bool:
 
 
 async def wait_for_gemini_ready(page, timeout_ms: int = 300_000):
-    deadline = asyncio.get_event_loop().time() + (timeout_ms / 1000.0)
-    while asyncio.get_event_loop().time() < deadline:
+    deadline = asyncio.get_running_loop().time() + (timeout_ms / 1000.0)
+    while asyncio.get_running_loop().time() < deadline:
         try:
             if is_on_gemini_ready(page.url):
                 return True
@@ -12,11 +12,12 @@ sys.path.insert(0, str(BASE_DIR))
 from proposal_from_config import load_project_config, generate_proposal
 
 
-def main():
+def regenerate() -> int:
+    """Generate the DOCX (+ PDF) in-process. Returns 0 on success, 1 if the config is missing."""
     config_path = BASE_DIR / "project_data" / "st_josephs_capitol_hill_phase1.json"
     if not config_path.exists():
         print(f"Config not found: {config_path}", file=sys.stderr)
-        sys.exit(1)
+        return 1
     out_docx = generate_proposal(config_path)
     print("Proposal saved:", out_docx)
     from proposal_generator import docx_to_pdf
@@ -27,6 +28,11 @@ def main():
     print("\nExhibit C: {} visits × ${}/visit = ${:,}".format(
         config["_est_visits"], config["price_per_visit"], config["_total_fee"]))
     print("Output path:", out_docx.parent.resolve())
+    return 0
+
+
+def main():
+    sys.exit(regenerate())
 
 
 if __name__ == "__main__":
@@ -17,16 +17,26 @@ Usage:
     python run_cw_leads_pipeline.py --pages 5 --headless --max-contacts 3
     python run_cw_leads_pipeline.py --skip-research   # use only CW detail-page contacts
     python run_cw_leads_pipeline.py --skip-telegram   # no Telegram sending (local only)
+    python run_cw_leads_pipeline.py --resume-from cw_leads_raw_20260218_1554.json  # skip scraping
 """
 from __future__ import annotations
 
 import argparse
 import asyncio
+import csv
+import hashlib
+import heapq
 import json
 import os
 import re
 import sys
-from datetime import datetime
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 
 try:
@@ -35,30 +45,64 @@ try:
 except ImportError:
     pass
 
+try:
+    import orjson  # optional: faster JSON for the leads dump / checkpoint
+except ImportError:
+    orjson = None
+
+try:
+    from requests_toolbelt import MultipartEncoder  # optional: streamed report uploads
+except ImportError:
+    MultipartEncoder = None
+
 import requests
-from playwright.async_api import async_playwright
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from constructionwire_login import COOKIES_PATH, has_saved_cookies, is_logged_in_url, LOGIN_URL
-from constructionwire_dc_leads import (
-    scrape_leads_from_current_page,
-    scrape_detail_page,
-    BASE_URL,
-)
-from deep_search_contacts import deep_search_contacts
+# Playwright / CW scraper / deep-search modules are imported inside the phases
+# that use them, so --help, --resume past Phase 1 and --skip-research start fast.
 
 # ─── Constants ────────────────────────────────────────────────────────────────
 BASE_DIR = Path(__file__).resolve().parent
 OUTBOUND_DIR = BASE_DIR / "Pending_Approval" / "Outbound"
 OUTBOUND_DIR.mkdir(parents=True, exist_ok=True)
 CHECKPOINT_PATH = BASE_DIR / "pipeline_checkpoint.json"
+RESEARCH_CACHE_DIR = BASE_DIR / ".cache" / "cw_research"
+DEEP_SEARCH_TTL = 7 * 86400   # seconds — contacts change slowly
+PHONE_TTL = 30 * 86400
 
 BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "").strip()
 CHAT_IDS_RAW = os.getenv("TELEGRAM_ALLOWED_CHAT_IDS", "").strip()
 CHAT_ID = CHAT_IDS_RAW.split(",")[0].strip() if CHAT_IDS_RAW else ""
 
+# Concurrent CW detail-page tabs in Phase 1 (keep modest — CW throttles aggressive clients)
+DETAIL_CONCURRENCY = max(1, int(os.getenv("CW_DETAIL_CONCURRENCY", "6")))
+# DuckDuckGo phone queries in flight across all Phase 2 workers (DDG rate-limits bursts)
+DDG_CONCURRENCY = max(1, int(os.getenv("CW_DDG_CONCURRENCY", "2")))
+_ddg_slots = threading.BoundedSemaphore(DDG_CONCURRENCY)
+
 NOW_STR = datetime.now().strftime("%Y%m%d_%H%M")
 TODAY = datetime.now().strftime("%Y-%m-%d")
 
+# ─── JSON I/O ─────────────────────────────────────────────────────────────────
+
+def _json_dump_atomic(path: Path, obj) -> None:
+    """Write obj as indented UTF-8 JSON via temp file + os.replace (orjson if installed)."""
+    tmp = path.with_name(path.name + ".tmp")
+    if orjson is not None:
+        tmp.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)  # streamed, no full-size str
+    os.replace(tmp, path)
+
+
+def _json_load(path: Path):
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
 # ─── Checkpoint utilities ─────────────────────────────────────────────────────
 
 def _checkpoint_load() -> dict:
@@ -66,7 +110,7 @@ def _checkpoint_load() -> dict:
     if not CHECKPOINT_PATH.exists():
         return {}
     try:
-        return json.loads(CHECKPOINT_PATH.read_text(encoding="utf-8"))
+        return _json_load(CHECKPOINT_PATH)
     except Exception:
         return {}
 
@@ -76,7 +120,7 @@ def _checkpoint_save(updates: dict) -> None:
     cp = _checkpoint_load()
     cp.update(updates)
     cp["last_updated"] = datetime.now().isoformat()
-    CHECKPOINT_PATH.write_text(json.dumps(cp, ensure_ascii=False, indent=2), encoding="utf-8")
+    _json_dump_atomic(CHECKPOINT_PATH, cp)
 
 
 def _checkpoint_clear() -> None:
@@ -100,6 +144,63 @@ def _checkpoint_resume_phase(cp: dict) -> int:
     return 8  # all done
 
 
+# ─── Research cache (Phase 2) ─────────────────────────────────────────────────
+# One JSON file per call, keyed by sha1 of the function name + args. Lets re-runs
+# over the same DC lead set skip Gemini / DDG for companies researched recently.
+# Empty results aren't cached — they're as likely to be a transient API/search
+# failure as a real "nothing found".
+
+def _research_cache_path(fn: str, *args) -> Path:
+    key = hashlib.sha1(f"{fn}:{json.dumps(args, ensure_ascii=False)}".encode("utf-8")).hexdigest()
+    return RESEARCH_CACHE_DIR / f"{key}.json"
+
+
+def _research_cache_get(fn: str, args: tuple, ttl: int):
+    """Return the cached value, or None if missing, expired, or unreadable."""
+    path = _research_cache_path(fn, *args)
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("ts", 0) > ttl:
+        return None
+    return entry.get("value")
+
+
+def _research_cache_set(fn: str, args: tuple, value) -> None:
+    try:
+        RESEARCH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _research_cache_path(fn, *args)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"ts": time.time(), "value": value}, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"    [cache] write failed: {e}")
+
+
+def _cached_deep_search(company: str, max_contacts: int) -> list[dict]:
+    args = (company, max_contacts)
+    hit = _research_cache_get("deep_search_contacts", args, DEEP_SEARCH_TTL)
+    if hit is not None:
+        return hit
+    from deep_search_contacts import deep_search_contacts
+    contacts = deep_search_contacts(company, max_contacts=max_contacts, use_gemini=True)
+    if contacts:
+        _research_cache_set("deep_search_contacts", args, contacts)
+    return contacts
+
+
+def _cached_search_phone(contact_name: str, company: str) -> str:
+    args = (contact_name, company)
+    hit = _research_cache_get("search_phone", args, PHONE_TTL)
+    if hit is not None:
+        return hit
+    phone = _search_phone(contact_name, company)
+    if phone:
+        _research_cache_set("search_phone", args, phone)
+    return phone
+
+
 # ─── Stage codes & service focus ─────────────────────────────────────────────
 # CW pcstgs codes (confirmed by inspection of search URL params):
 #   1 = Planning   2 = Proposed   3 = Starts 1-3 mo   4 = Starts 4-12 mo
@@ -109,6 +210,7 @@ DEFAULT_STAGES = [1, 2, 3, 4, 5, 6, 7]
 
 def _build_search_url(stages: list[int]) -> str:
     params = "&".join(f"pcstgs={s}" for s in stages)
+    from constructionwire_dc_leads import BASE_URL
     return f"{BASE_URL}/Client/Report?rtid=1&rss=DC&{params}&p=1"
 
 
@@ -191,34 +293,132 @@ ROLE_PREFIXES: list[tuple[str, str]] = [
     ("(C)",   "GC/Contractor"),
     ("(A)",   "Architect"),
 ]
+# Alternation keeps ROLE_PREFIXES order, so the longest-first rule above still holds.
+_ROLE_RE = re.compile(r"^(" + "|".join(re.escape(p) for p, _ in ROLE_PREFIXES) + r")(.*)$")
+_ROLE_MAP = dict(ROLE_PREFIXES)
+
+
+# ─── Precompiled patterns ─────────────────────────────────────────────────────
+_PHONE_RE = re.compile(r"\b(?:\+1[\s.\-]?)?(?:\(?\d{3}\)?[\s.\-]?)?\d{3}[\s.\-]?\d{4}\b")
+_CLEAN_SPLIT_RE = re.compile(r"[\n\t]")  # CW appends nav text after newline/tab
+# Draft slugs: every non-word char → "_". The translate table covers ASCII; names
+# with non-ASCII characters fall back to the regex (\w is Unicode-aware).
+_SLUG_TABLE = str.maketrans({
+    c: "_" for c in map(chr, range(128)) if not (c.isalnum() or c == "_")
+})
+_NONWORD_RE = re.compile(r"[^\w]")
+_UNDERSCORES_RE = re.compile(r"_+")
 
 
 # ─── Telegram helpers ─────────────────────────────────────────────────────────
+# One keep-alive session for every sendMessage chunk / sendDocument, with
+# automatic backoff on 429 and transient 5xx.
+_TG_SESSION = requests.Session()
+_TG_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=4,
+    max_retries=Retry(
+        total=3, backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["POST"],
+        raise_on_status=False,  # after the last retry hand back the 429/5xx response, don't raise
+    ),
+))
+_TG_STREAM_MIN_BYTES = 1 << 20  # reports above 1 MB upload via MultipartEncoder when available
+
+# Telegram caps a bot at ~30 messages/second. Token bucket: 30 tokens, refilled
+# continuously at 30/s; each POST takes one token and sleeps when empty.
+_TG_RATE = 30.0
+_tg_tokens = _TG_RATE
+_tg_last_refill = time.monotonic()
+_tg_lock = threading.Lock()
+
+
+def _acquire_token() -> None:
+    global _tg_tokens, _tg_last_refill
+    with _tg_lock:
+        now = time.monotonic()
+        _tg_tokens = min(_TG_RATE, _tg_tokens + (now - _tg_last_refill) * _TG_RATE)
+        _tg_last_refill = now
+        if _tg_tokens < 1.0:
+            time.sleep((1.0 - _tg_tokens) / _TG_RATE)
+            _tg_last_refill = time.monotonic()
+            _tg_tokens = 1.0
+        _tg_tokens -= 1.0
+
+
 def tg_message(text: str) -> bool:
     if not BOT_TOKEN or not CHAT_ID:
         print("[TG] No bot token/chat ID — skipping.")
         return False
     url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
     for chunk in [text[i : i + 4096] for i in range(0, len(text), 4096)]:
-        r = requests.post(url, json={"chat_id": CHAT_ID, "text": chunk}, timeout=15)
+        _acquire_token()
+        try:
+            r = _TG_SESSION.post(url, json={"chat_id": CHAT_ID, "text": chunk}, timeout=15)
+        except requests.RequestException as e:
+            print(f"[TG] Message send failed: {e}")
+            return False
         if not r.ok:
             print(f"[TG] Message error: {r.status_code} {r.text[:200]}")
             return False
     return True
 
 
+# Packing budget for tg_messages. Telegram's 4096 limit counts UTF-16 code
+# units (emoji such as "📨" are 2), so measure that way and leave headroom.
+_TG_PACK_LIMIT = 3900
+
+
+def _utf16_len(s: str) -> int:
+    return len(s.encode("utf-16-le")) // 2
+
+
+def tg_messages(messages: list[str], sep: str = "\n\n") -> bool:
+    """
+    Send several messages, packing consecutive ones into as few Telegram
+    messages as possible (up to _TG_PACK_LIMIT UTF-16 units each). Messages
+    longer than the limit go out alone (tg_message splits them).
+    """
+    ok = True
+    buf: list[str] = []
+    buf_len = 0
+    sep_len = _utf16_len(sep)
+    for msg in messages:
+        msg_len = _utf16_len(msg)
+        if buf and buf_len + sep_len + msg_len > _TG_PACK_LIMIT:
+            ok = tg_message(sep.join(buf)) and ok
+            buf, buf_len = [], 0
+        buf_len += msg_len + (sep_len if buf else 0)
+        buf.append(msg)
+    if buf:
+        ok = tg_message(sep.join(buf)) and ok
+    return ok
+
+
 def tg_document(file_path: Path, caption: str = "") -> bool:
     if not BOT_TOKEN or not CHAT_ID:
         return False
     url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendDocument"
     try:
+        _acquire_token()
         with open(file_path, "rb") as f:
-            r = requests.post(
-                url,
-                data={"chat_id": CHAT_ID, "caption": caption[:1024]},
-                files={"document": (file_path.name, f)},
-                timeout=60,
-            )
+            if MultipartEncoder is not None and os.fstat(f.fileno()).st_size > _TG_STREAM_MIN_BYTES:
+                # Stream from disk instead of building the whole multipart body in memory.
+                # Plain requests.post: the session's Retry can't rewind a consumed stream.
+                encoder = MultipartEncoder(fields={
+                    "chat_id": CHAT_ID,
+                    "caption": caption[:1024],
+                    "document": (file_path.name, f, "text/markdown"),
+                })
+                r = requests.post(
+                    url, data=encoder, headers={"Content-Type": encoder.content_type}, timeout=60
+                )
+            else:
+                r = _TG_SESSION.post(
+                    url,
+                    data={"chat_id": CHAT_ID, "caption": caption[:1024]},
+                    files={"document": (file_path.name, f)},
+                    timeout=60,
+                )
         if not r.ok:
             print(f"[TG] Document error: {r.status_code} {r.text[:200]}")
             return False
@@ -241,15 +441,12 @@ def _parse_all_companies(companies_cell: str) -> list[tuple[str, str]]:
         line = line.strip()
         if not line:
             continue
-        matched = False
-        for prefix, role in ROLE_PREFIXES:
-            if line.startswith(prefix):
-                company = line[len(prefix):].strip()
-                if company:
-                    results.append((company, role))
-                matched = True
-                break
-        if not matched and line:
+        m = _ROLE_RE.match(line)
+        if m:
+            company = m.group(2).strip()
+            if company:
+                results.append((company, _ROLE_MAP[m.group(1)]))
+        else:
             # Unknown prefix — include as generic company
             results.append((line, "Company"))
     return results
@@ -261,6 +458,7 @@ def _first_name(full_name: str) -> str:
     return parts[0] if parts else ""
 
 
+@lru_cache(maxsize=4096)
 def _clean_company_name(name: str) -> str:
     """
     Strip CW navigation text appended to company names in detail pages.
@@ -269,10 +467,46 @@ def _clean_company_name(name: str) -> str:
     if not name:
         return ""
     # Split on first newline or tab and take the first part
-    cleaned = re.split(r"[\n\t]", name)[0].strip()
+    cleaned = _CLEAN_SPLIT_RE.split(name, 1)[0].strip()
     return cleaned
 
 
+# ─── Columnar view of CW detail-page contacts ─────────────────────────────────
+@dataclass
+class LeadsColumns:
+    """
+    Every CW detail-page contact across all leads, flattened into parallel lists
+    (one entry per contact) with fields already cleaned/stripped. Contacts of lead
+    i occupy rows lead_start[i]:lead_start[i+1], so per-lead order is preserved.
+    Built once after Phase 1; Phase 2 and Phase 5 scan these instead of re-.get()ing
+    and re-cleaning the nested lead dicts.
+    """
+    lead_start: list[int] = field(default_factory=lambda: [0])
+    company: list[str] = field(default_factory=list)       # _clean_company_name(...)
+    name: list[str] = field(default_factory=list)          # detail "name" only
+    name_or_contact: list[str] = field(default_factory=list)  # name, else first line of "contact"
+    email: list[str] = field(default_factory=list)
+    role: list[str] = field(default_factory=list)
+
+    def rows(self, lead_idx: int) -> range:
+        return range(self.lead_start[lead_idx], self.lead_start[lead_idx + 1])
+
+
+def _build_leads_columns(leads: list[dict]) -> LeadsColumns:
+    cols = LeadsColumns()
+    for lead in leads:
+        for dc in lead.get("detail_contacts", []):
+            cols.company.append(_clean_company_name(dc.get("company") or ""))
+            cols.name.append((dc.get("name") or "").strip())
+            cols.name_or_contact.append(
+                (dc.get("name") or dc.get("contact", "").split("\n")[0]).strip()
+            )
+            cols.email.append((dc.get("email") or "").strip())
+            cols.role.append((dc.get("role") or "").strip())
+        cols.lead_start.append(len(cols.company))
+    return cols
+
+
 # ─── Phase 1: Playwright scraping ─────────────────────────────────────────────
 async def phase1_scrape_leads(
     headless: bool = False, max_pages: int = 10, stages: list[int] | None = None
@@ -282,6 +516,10 @@ async def phase1_scrape_leads(
     stages: list of CW pcstgs codes (1=Planning,2=Proposed,3-5=1-12mo,6=Groundbreaking,7=Early Construction)
     Returns list of lead dicts with companies_parsed, detail_contacts, construction_start, etc.
     """
+    from playwright.async_api import async_playwright
+    from constructionwire_login import COOKIES_PATH, has_saved_cookies, is_logged_in_url, LOGIN_URL
+    from constructionwire_dc_leads import scrape_leads_from_current_page, scrape_detail_page
+
     if stages is None:
         stages = DEFAULT_STAGES
     search_url = _build_search_url(stages)
@@ -309,11 +547,9 @@ async def phase1_scrape_leads(
 
         try:
             # Verify login via saved cookies
+            # CW long-polls XHRs so networkidle never settles — the post-redirect URL
+            # after domcontentloaded is the real login signal.
             await page.goto(LOGIN_URL, wait_until="domcontentloaded")
-            try:
-                await page.wait_for_load_state("networkidle", timeout=8000)
-            except Exception:
-                pass  # CW long-polls XHRs — networkidle is unreliable, URL check below is the real signal
             if not is_logged_in_url(page.url):
                 print("CW cookies expired. Please re-run: python constructionwire_login.py")
                 return []
@@ -346,31 +582,52 @@ async def phase1_scrape_leads(
 
             print(f"\nTotal list-page leads: {len(all_leads)}")
 
-            # Scrape detail pages for ALL leads
-            print("\nScraping detail pages for each lead...")
-            for i, lead in enumerate(all_leads):
-                detail_url = lead.get("detail_url", "")
-                if not detail_url:
-                    lead["detail_contacts"] = []
-                    lead["companies_parsed"] = _parse_all_companies(lead.get("companies", ""))
-                    continue
-                print(f"  [{i+1}/{len(all_leads)}] {(lead.get('project_name','') or '')[:55]}...")
-                try:
-                    extra = await scrape_detail_page(page, detail_url)
-                    lead["detail"] = extra
-                    if extra.get("stage"):
-                        lead["stage"] = extra["stage"]
-                    if extra.get("construction_start"):
-                        lead["construction_start"] = extra["construction_start"]
-                    if extra.get("construction_end"):
-                        lead["construction_end"] = extra["construction_end"]
-                    lead["detail_contacts"] = extra.get("contacts", [])
-                except Exception as e:
-                    print(f"    Detail error: {e}")
-                    lead["detail"] = {}
-                    lead["detail_contacts"] = []
-                finally:
-                    lead["companies_parsed"] = _parse_all_companies(lead.get("companies", ""))
+            # Scrape detail pages for ALL leads — a fixed pool of tabs in the same
+            # (already authenticated) context, each pulling leads from a shared queue.
+            # Pool size bounds concurrency so CW doesn't rate-limit us; tabs are
+            # reused across leads and only closed at the end.
+            n_tabs = min(DETAIL_CONCURRENCY, len(all_leads))
+            print(f"\nScraping detail pages for each lead ({n_tabs} tabs)...")
+            total = len(all_leads)
+            queue: asyncio.Queue[tuple[int, dict]] = asyncio.Queue()
+            for item in enumerate(all_leads):
+                queue.put_nowait(item)
+            pages = [page] + [await context.new_page() for _ in range(n_tabs - 1)]
+
+            async def _worker(tab) -> None:
+                while True:
+                    try:
+                        i, lead = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    detail_url = lead.get("detail_url", "")
+                    if not detail_url:
+                        lead["detail_contacts"] = []
+                        lead["companies_parsed"] = _parse_all_companies(lead.get("companies", ""))
+                        continue
+                    print(f"  [{i+1}/{total}] {(lead.get('project_name','') or '')[:55]}...")
+                    try:
+                        extra = await scrape_detail_page(tab, detail_url)
+                        lead["detail"] = extra
+                        if extra.get("stage"):
+                            lead["stage"] = extra["stage"]
+                        if extra.get("construction_start"):
+                            lead["construction_start"] = extra["construction_start"]
+                        if extra.get("construction_end"):
+                            lead["construction_end"] = extra["construction_end"]
+                        lead["detail_contacts"] = extra.get("contacts", [])
+                    except Exception as e:
+                        print(f"    Detail error ({i+1}): {e}")
+                        lead["detail"] = {}
+                        lead["detail_contacts"] = []
+                    finally:
+                        lead["companies_parsed"] = _parse_all_companies(lead.get("companies", ""))
+
+            try:
+                await asyncio.gather(*(_worker(tab) for tab in pages))
+            finally:
+                for tab in pages[1:]:
+                    await tab.close()
 
         finally:
             await browser.close()
@@ -380,8 +637,11 @@ async def phase1_scrape_leads(
 
 
 # ─── Phase 2: Deep search + phone ─────────────────────────────────────────────
-def _search_phone(contact_name: str, company: str) -> str:
-    """Try to find a phone number for a contact via DuckDuckGo/ddgs. Returns first match or ''."""
+def _search_phone(contact_name: str, company: str, allow_domains: set[str] | None = None) -> str:
+    """
+    Try to find a phone number for a contact via DuckDuckGo/ddgs. Returns first match or ''.
+    allow_domains: if given, only results whose href contains one of these domains are scanned.
+    """
     try:
         from ddgs import DDGS
     except ImportError:
@@ -391,33 +651,97 @@ def _search_phone(contact_name: str, company: str) -> str:
             return ""
     if not contact_name or not company:
         return ""
-    phone_re = re.compile(r"\b(?:\+1[\s.\-]?)?(?:\(?\d{3}\)?[\s.\-]?)?\d{3}[\s.\-]?\d{4}\b")
     try:
-        with DDGS() as ddgs:
+        with _ddg_slots, DDGS() as ddgs:
             for q in [f'"{contact_name}" {company} phone', f'"{contact_name}" {company} contact number']:
                 for r in ddgs.text(q, max_results=5):
-                    body = (r.get("body") or "") + " " + (r.get("title") or "")
-                    phones = [m for m in phone_re.findall(body) if len(re.sub(r"\D", "", m)) >= 10]
-                    if phones:
-                        return phones[0]
+                    if allow_domains and not any(d in (r.get("href") or "") for d in allow_domains):
+                        continue
+                    text = (r.get("body") or "") + " " + (r.get("title") or "")
+                    for m in _PHONE_RE.finditer(text):
+                        if sum(ch.isdigit() for ch in m.group(0)) >= 10:
+                            return m.group(0)
     except Exception:
         pass
     return ""
 
 
+def _research_one(
+    company: str, role: str, cw_dcs: list[tuple[str, str, str]], max_contacts: int
+) -> tuple[list[dict], list[str]]:
+    """
+    Research a single company (runs in a Phase 2 worker thread).
+    cw_dcs: (name, email, role) of the company's CW detail-page contacts.
+    Returns (final_contacts, log_lines); log lines are printed by the caller so
+    output from concurrent workers doesn't interleave.
+    """
+    log: list[str] = []
+
+    # Step A: collect verified contacts from CW detail pages
+    cw_contacts: list[dict] = []
+    seen_emails: set[str] = set()
+    for name, email, dc_role in cw_dcs:
+        if email and email in seen_emails:
+            continue
+        if email:
+            seen_emails.add(email)
+        cw_contacts.append({
+            "name": name,
+            "role": dc_role,
+            "email": email,
+            "phone": "",
+            "source": "ConstructionWire detail page",
+        })
+
+    # Step B: deep search to supplement
+    ds_contacts = _cached_deep_search(company, max_contacts)
+    for c in ds_contacts:
+        e = (c.get("email") or "").strip()
+        if e and e in seen_emails:
+            continue
+        if e:
+            seen_emails.add(e)
+        cw_contacts.append({
+            "name": (c.get("name") or "").strip(),
+            "role": (c.get("role") or "").strip(),
+            "email": e,
+            "phone": "",
+            "source": c.get("source", "deep search"),
+        })
+
+    # Keep only max_contacts, prioritize those with emails
+    cw_contacts.sort(key=lambda c: (0 if c["email"] else 1))
+    final_contacts = cw_contacts[:max_contacts]
+
+    # Step C: phone lookup for contacts that have a name + email. Serial here —
+    # Phase 2 already runs companies in parallel and _ddg_slots caps DDG overall.
+    for c in final_contacts[:3]:
+        if c["phone"] or not c.get("name") or not c.get("email"):
+            continue
+        phone = _cached_search_phone(c["name"], company)
+        if phone:
+            c["phone"] = phone
+            log.append(f"    Phone found for {c['name']}: {phone}")
+
+    return final_contacts, log
+
+
 def phase2_research_companies(
     leads: list[dict],
     max_contacts: int = 3,
     existing_research: dict | None = None,
     skip_companies: set | None = None,
+    cols: LeadsColumns | None = None,
 ) -> dict[str, dict]:
     """
-    Deep-search every unique company found across all leads.
+    Deep-search every unique company found across all leads, CW_RESEARCH_WORKERS
+    (default 8) companies at a time.
     Returns: company_name -> {role, contacts: [{name, role, email, phone, source}]}
     Priority: ConstructionWire detail-page contacts (verified) then deep search supplements.
 
     existing_research: partial results from a previous interrupted run (checkpoint resume).
     skip_companies: set of company names already fully researched (skip them).
+    cols: prebuilt LeadsColumns for leads (built here if not given).
     """
     print(f"\n{'='*60}")
     print("Phase 2: Deep-Searching Companies for Key Contacts")
@@ -429,19 +753,23 @@ def phase2_research_companies(
         "GC/Contractor": 3, "Construction Manager": 4,
         "Architect": 5, "Structural Engineer": 6, "MEP Engineer": 7, "Company": 99,
     }
+    if cols is None:
+        cols = _build_leads_columns(leads)
     company_role_map: dict[str, str] = {}
-    for lead in leads:
+    # Index CW detail-page contacts by cleaned, lowercased company name so each
+    # company's Step A is a dict lookup instead of a rescan of every lead.
+    cw_by_company: dict[str, list[tuple[str, str, str]]] = defaultdict(list)
+    for li, lead in enumerate(leads):
         for (company, role) in lead.get("companies_parsed", []):
             if company:
                 existing = company_role_map.get(company)
                 if existing is None or role_priority.get(role, 99) < role_priority.get(existing, 99):
                     company_role_map[company] = role
-        for dc in lead.get("detail_contacts", []):
-            # Clean company name — detail pages append navigation text after newline/tab
-            comp = _clean_company_name(dc.get("company") or "")
-            role = (dc.get("role") or "Company").strip()
+        for k in cols.rows(li):
+            comp = cols.company[k]
+            cw_by_company[comp.lower()].append((cols.name_or_contact[k], cols.email[k], cols.role[k]))
             if comp and comp not in company_role_map:
-                company_role_map[comp] = role
+                company_role_map[comp] = cols.role[k] or "Company"
 
     print(f"Unique companies to research: {len(company_role_map)}")
 
@@ -451,85 +779,51 @@ def phase2_research_companies(
     if _skip:
         print(f"  [RESUME] Skipping {len(_skip)} already-researched companies.")
 
-    for idx, (company, role) in enumerate(company_role_map.items()):
-        if company in _skip:
-            continue
-        print(f"\n  [{idx+1}/{len(company_role_map)}] {company} ({role})")
-
-        # Step A: collect verified contacts from CW detail pages
-        cw_contacts: list[dict] = []
-        seen_emails: set[str] = set()
-        for lead in leads:
-            for dc in lead.get("detail_contacts", []):
-                # Compare using cleaned company name to handle navigation text
-                if _clean_company_name(dc.get("company") or "").lower() != company.lower():
-                    continue
-                name = (dc.get("name") or dc.get("contact", "").split("\n")[0]).strip()
-                email = (dc.get("email") or "").strip()
-                if email and email in seen_emails:
-                    continue
-                if email:
-                    seen_emails.add(email)
-                cw_contacts.append({
-                    "name": name,
-                    "role": (dc.get("role") or "").strip(),
-                    "email": email,
-                    "phone": "",
-                    "source": "ConstructionWire detail page",
-                })
-
-        # Step B: deep search to supplement
-        ds_contacts = deep_search_contacts(company, max_contacts=max_contacts, use_gemini=True)
-        for c in ds_contacts:
-            e = (c.get("email") or "").strip()
-            if e and e in seen_emails:
+    total = len(company_role_map)
+    todo = [
+        (idx, company, role)
+        for idx, (company, role) in enumerate(company_role_map.items())
+        if company not in _skip
+    ]
+    workers = max(1, int(os.getenv("CW_RESEARCH_WORKERS", "8")))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {
+            ex.submit(
+                _research_one, company, role,
+                cw_by_company.get(company.lower(), []), max_contacts,
+            ): (idx, company, role)
+            for idx, company, role in todo
+        }
+        for fut in as_completed(futures):
+            idx, company, role = futures[fut]
+            print(f"\n  [{idx+1}/{total}] {company} ({role})")
+            try:
+                final_contacts, log_lines = fut.result()
+            except Exception as e:
+                print(f"    Research error: {e}")
                 continue
-            if e:
-                seen_emails.add(e)
-            cw_contacts.append({
-                "name": (c.get("name") or "").strip(),
-                "role": (c.get("role") or "").strip(),
-                "email": e,
-                "phone": "",
-                "source": c.get("source", "deep search"),
+            for line in log_lines:
+                print(line)
+            results[company] = {"role": role, "contacts": final_contacts}
+            _skip.add(company)
+            found = sum(1 for c in final_contacts if c.get("email"))
+            print(f"    Contacts with email: {found} / {len(final_contacts)}")
+            # Incremental checkpoint save so a crash mid-phase is recoverable
+            _checkpoint_save({
+                "phase2_company_research": results,
+                "phase2_researched": list(_skip),
             })
 
-        # Keep only max_contacts, prioritize those with emails
-        cw_contacts.sort(key=lambda c: (0 if c["email"] else 1))
-        final_contacts = cw_contacts[:max_contacts]
-
-        # Step C: phone lookup for contacts that have a name + email
-        for c in final_contacts[:3]:
-            if not c["phone"] and c.get("name") and c.get("email"):
-                phone = _search_phone(c["name"], company)
-                if phone:
-                    c["phone"] = phone
-                    print(f"    Phone found for {c['name']}: {phone}")
-
-        results[company] = {"role": role, "contacts": final_contacts}
-        _skip.add(company)
-        found = sum(1 for c in final_contacts if c.get("email"))
-        print(f"    Contacts with email: {found} / {len(final_contacts)}")
-        # Incremental checkpoint save so a crash mid-phase is recoverable
-        _checkpoint_save({
-            "phase2_company_research": results,
-            "phase2_researched": list(_skip),
-        })
-
     print(f"\nPhase 2 complete: {len(results)} companies researched.")
     return results
 
 
 # ─── Phase 3: Compile report ───────────────────────────────────────────────────
-def phase3_compile_report(leads: list[dict], company_research: dict[str, dict]) -> str:
+def _compile_report_summary(leads: list[dict]) -> str:
     """
-    Compile a Markdown leads + contacts report.
-    Columns: Project, Stage, Est. Value, Start Date, Company, Role, Contact, Email, Phone
+    Summary section of the leads report (header + one table row per lead), i.e.
+    everything before "## Detailed Contacts per Project". Cheap: no research lookups.
     """
-    print(f"\n{'='*60}")
-    print("Phase 3: Compiling Leads Report")
-    print(f"{'='*60}")
-
     lines = [
         "# BCC DC Construction Leads Report",
         f"_Generated: {TODAY} | Source: ConstructionWire DC | Stages: 1–12 months_\n",
@@ -548,8 +842,17 @@ def phase3_compile_report(leads: list[dict], company_research: dict[str, dict])
             f"{r}: {c}" for c, r in lead.get("companies_parsed", [])
         )[:65]
         lines.append(f"| {i} | {project} | {stage} | {value} | {start} | {companies_str} |")
+    lines += ["\n---\n", ""]
+    return "\n".join(lines)
+
+
+def _write_report_details(f, leads: list[dict], company_research: dict[str, dict]) -> None:
+    """Stream the "## Detailed Contacts per Project" section to the open text file f."""
+    f.write("## Detailed Contacts per Project\n")
 
-    lines += ["\n---\n", "## Detailed Contacts per Project\n"]
+    def emit(line: str) -> None:
+        f.write("\n")
+        f.write(line)
 
     for i, lead in enumerate(leads, 1):
         project = (lead.get("project_name") or "N/A").strip()
@@ -561,42 +864,63 @@ def phase3_compile_report(leads: list[dict], company_research: dict[str, dict])
         start = (lead.get("construction_start") or lead.get("schedule") or "TBD").strip()
         url = lead.get("detail_url", "")
 
-        lines.append(f"### {i}. {project}")
+        emit(f"### {i}. {project}")
         if addr:
-            lines.append(f"- **Address:** {addr}")
-        lines.append(f"- **Stage:** {stage}")
-        lines.append(f"- **Est. Value:** {value}")
-        lines.append(f"- **Construction Start:** {start}")
+            emit(f"- **Address:** {addr}")
+        emit(f"- **Stage:** {stage}")
+        emit(f"- **Est. Value:** {value}")
+        emit(f"- **Construction Start:** {start}")
         if url:
-            lines.append(f"- **CW Link:** {url}")
-        lines.append("")
+            emit(f"- **CW Link:** {url}")
+        emit("")
 
         companies_parsed = lead.get("companies_parsed", [])
         if not companies_parsed:
-            lines.append("_No companies parsed._\n")
+            emit("_No companies parsed._\n")
             continue
 
-        lines.append("| Company | Role | Contact | Email | Phone |")
-        lines.append("|---------|------|---------|-------|-------|")
+        emit("| Company | Role | Contact | Email | Phone |")
+        emit("|---------|------|---------|-------|-------|")
         for (company, role) in companies_parsed:
             contacts = company_research.get(company, {}).get("contacts", [])
             if not contacts:
-                lines.append(f"| {company} | {role} | — | — | — |")
+                emit(f"| {company} | {role} | — | — | — |")
             else:
                 for c in contacts:
                     name = (c.get("name") or "").strip() or "—"
                     email = (c.get("email") or "").strip() or "—"
                     phone = (c.get("phone") or "").strip() or "—"
                     crow = (c.get("role") or role).strip() or role
-                    lines.append(f"| {company} | {crow} | {name} | {email} | {phone} |")
-        lines.append("")
+                    emit(f"| {company} | {crow} | {name} | {email} | {phone} |")
+        emit("")
+
+
+def phase3_compile_report(
+    leads: list[dict], company_research: dict[str, dict], out_path: Path
+) -> str:
+    """
+    Compile a Markdown leads + contacts report and write it to out_path.
+    Columns: Project, Stage, Est. Value, Start Date, Company, Role, Contact, Email, Phone
+    The per-project detail section is streamed straight to disk; only the summary
+    section (everything before "## Detailed Contacts per Project") is returned, for
+    the console preview and the Phase 4 Telegram message.
+    """
+    print(f"\n{'='*60}")
+    print("Phase 3: Compiling Leads Report")
+    print(f"{'='*60}")
+
+    summary = _compile_report_summary(leads)
+    with out_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(summary)
+        _write_report_details(f, leads, company_research)
 
     print("Phase 3 complete.")
-    return "\n".join(lines)
+    return summary
 
 
 # ─── Phase 4: Send report to Telegram ─────────────────────────────────────────
 def phase4_send_report_telegram(report_md: str, report_path: Path) -> None:
+    """report_md: the report summary (a full report is also accepted and trimmed)."""
     print(f"\n{'='*60}")
     print("Phase 4: Sending Leads Report to Telegram")
     print(f"{'='*60}")
@@ -771,6 +1095,213 @@ def _title_is_valid_target(title: str) -> tuple[bool, str]:
     return (False, f"title '{title.strip()}' not on whitelist")
 
 
+# Shared pitch bullets (rules § 0-C / § 0-E)
+_BULLET_EXPERTISE = (
+    "Multi-Discipline Expertise: Our team brings together licensed Professional Engineers "
+    "across all major disciplines and multiple ICC Master Code Professionals (MCP). We handle "
+    "Building, Mechanical, Electrical, Plumbing, and Fire Protection code inspections and plan "
+    "review — and serve as a hands-on technical resource for code compliance questions, "
+    "providing professional guidance when issues arise."
+)
+_BULLET_SCHEDULING = (
+    "Responsive Scheduling: We offer same-day or next-business-day inspection availability "
+    "to keep your project milestones on track."
+)
+_BULLET_BILLING = (
+    "Fair, Visit-Based Billing: Billing is based on actual visits completed — our fee is a "
+    "flat rate per inspection visit actually performed. You will never be billed based on an "
+    "upfront estimate. If your project wraps up in fewer inspections than projected, you pay "
+    "only for what was done."
+)
+
+# Email body templates — built once at import, filled per email with str.format.
+# Placeholders: {salutation}, {company}, {project_name}.
+
+# GC / CM: inspection pitch only, no plan review (rules § 0-C)
+_GC_TEMPLATE = "\n".join([
+    "{salutation}",
+    "",
+    "I noticed {company} is working on {project_name} in Washington, DC and wanted "
+    "to take a moment to introduce Building Code Consulting LLC (BCC) as a potential "
+    "resource for your Third-Party Inspection needs.",
+    "",
+    "BCC is a DC-based engineering firm focused exclusively on Washington, D.C. "
+    "Third-Party Code Compliance Inspections. A few reasons {company} may find us "
+    "a strong fit for this project:",
+    "",
+    _BULLET_EXPERTISE,
+    "",
+    _BULLET_SCHEDULING,
+    "",
+    _BULLET_BILLING,
+    "",
+    "We are not submitting a formal proposal at this stage, but if you are still "
+    "finalizing your inspection vendor list for this project, we would welcome the "
+    "opportunity to provide a competitive quote.",
+    "",
+    "Are you open to a quick 5-minute call or a brief capability overview?",
+])
+
+# Early-stage Developer/Owner: lead with Plan Review
+_DEV_PLAN_REVIEW_TEMPLATE = "\n".join([
+    "{salutation}",
+    "",
+    "I came across {project_name} and wanted to briefly introduce Building Code "
+    "Consulting LLC (BCC) as a resource for {company}'s Third-Party Plan Review "
+    "and Code Compliance Inspection needs.",
+    "",
+    "BCC is a DC-based firm specializing in Third-Party Plan Review and Code "
+    "Compliance Inspections. At this stage of the project, our plan review services "
+    "can help identify and resolve code issues before submission — saving time and "
+    "avoiding costly revision cycles. A few highlights:",
+    "",
+    _BULLET_EXPERTISE,
+    "",
+    "Plan Review Services: We provide expedited Third-Party Plan Review for DC and "
+    "nationwide jurisdictions. Our reviews identify code deficiencies before "
+    "submission, reducing agency review cycles and keeping your schedule on track.",
+    "",
+    _BULLET_BILLING,
+    "",
+    "We are not submitting a formal proposal at this stage, but if you would like "
+    "to learn more about how BCC can support {project_name} through plan review or "
+    "future inspections, we would welcome the conversation.",
+    "",
+    "Are you open to a quick 5-minute call?",
+])
+
+# Later-stage Developer/Owner: lead with Inspections, note plan review
+_DEV_INSPECTION_TEMPLATE = "\n".join([
+    "{salutation}",
+    "",
+    "I came across {project_name} and wanted to briefly introduce Building Code "
+    "Consulting LLC (BCC) as a resource for {company}'s Third-Party Inspection "
+    "and Plan Review needs.",
+    "",
+    "BCC is a DC-based firm specializing in Third-Party Code Compliance Inspections "
+    "and Plan Review. A few highlights:",
+    "",
+    _BULLET_EXPERTISE,
+    "",
+    _BULLET_SCHEDULING,
+    "",
+    _BULLET_BILLING,
+    "",
+    "Also, as a quick note — BCC also offers Third-Party Plan Review Services for DC "
+    "and nationwide jurisdictions. If your team needs expedited pre-submission code "
+    "review or peer review, we would be glad to assist.",
+    "",
+    "We are not submitting a formal proposal at this stage, but if you would like to "
+    "learn more about our services for {project_name}, we would welcome the conversation.",
+    "",
+    "Are you open to a quick 5-minute call?",
+])
+
+# Architect pitch — Plan Review ONLY. Drop visit-billing (not their cost),
+# drop generic "schedule" language, lead with DOB deficiency pain.
+_ARCHITECT_TEMPLATE = "\n".join([
+    "{salutation}",
+    "",
+    "Quick note on {project_name} — I'm with Building Code Consulting LLC (BCC), "
+    "a DC firm that does Third-Party Plan Review for architects. Wanted to flag us "
+    "as a resource before {company} submits to DOB.",
+    "",
+    "Most of the value for architects is catching code issues before they come back "
+    "as DOB deficiency comments:",
+    "",
+    "• Pre-submission peer review across all five disciplines — Building, Mechanical, "
+    "Electrical, Plumbing, Fire Protection. Our team has licensed PEs in each + "
+    "multiple ICC Master Code Professionals.",
+    "",
+    "• Expedited turnaround — we typically return mark-ups in days, not weeks, so "
+    "your permit path doesn't slip while waiting on us.",
+    "",
+    "• Gap-coverage for disciplines your sub-consultants don't carry (e.g., fire "
+    "protection on smaller projects). We seal what's needed.",
+    "",
+    "Not pitching a formal engagement here — just wanted you to know we're available "
+    "if DOB push-back on {project_name} becomes a schedule risk, or if a second set "
+    "of eyes before submittal would be useful.",
+    "",
+    "Worth a 10-minute call to walk through a recent DC project we reviewed?",
+])
+
+# Default (unknown role), early stage: conservative Plan Review + Inspection pitch
+_DEFAULT_PLAN_REVIEW_TEMPLATE = "\n".join([
+    "{salutation}",
+    "",
+    "I came across {project_name} and wanted to briefly introduce Building Code "
+    "Consulting LLC (BCC) as a resource for Third-Party Plan Review and Inspection needs.",
+    "",
+    "BCC is a DC-based engineering firm specializing in Washington, D.C. Third-Party "
+    "Code Compliance Plan Review and Inspections. A few reasons we may be a strong fit:",
+    "",
+    _BULLET_EXPERTISE,
+    "",
+    "Plan Review Services: We offer expedited Third-Party Plan Review for DC and "
+    "nationwide jurisdictions — helping identify code issues before submission.",
+    "",
+    _BULLET_BILLING,
+    "",
+    "We are not submitting a formal proposal at this stage, but if you are exploring "
+    "plan review or inspection resources for this project, we would welcome a brief conversation.",
+    "",
+    "Are you open to a quick 5-minute call?",
+])
+
+# Default (unknown role), later stage: inspection pitch
+_DEFAULT_INSPECTION_TEMPLATE = "\n".join([
+    "{salutation}",
+    "",
+    "I came across {project_name} and wanted to briefly introduce Building Code "
+    "Consulting LLC (BCC) as a potential resource for Third-Party Inspection needs.",
+    "",
+    "BCC is a DC-based engineering firm specializing in Washington, D.C. Third-Party "
+    "Code Compliance Inspections. A few reasons we may be a strong fit:",
+    "",
+    _BULLET_EXPERTISE,
+    "",
+    _BULLET_SCHEDULING,
+    "",
+    _BULLET_BILLING,
+    "",
+    "We are not submitting a formal proposal at this stage, but if you are exploring "
+    "inspection vendors for this project, we would welcome a brief conversation.",
+    "",
+    "Are you open to a quick 5-minute call?",
+])
+
+
+def _truncate_project(p: str, limit: int) -> str:
+    """Shorten a project name for the subject line, ending with an ellipsis if cut."""
+    return p if len(p) <= limit else p[: max(1, limit - 1)].rstrip() + "…"
+
+
+# (role class, plan-review focus) → body template. GC/CM never gets the plan-review pitch.
+_TEMPLATES = {
+    ("gc", False): _GC_TEMPLATE,
+    ("gc", True): _GC_TEMPLATE,
+    ("dev", False): _DEV_INSPECTION_TEMPLATE,
+    ("dev", True): _DEV_PLAN_REVIEW_TEMPLATE,
+    ("arch", False): _ARCHITECT_TEMPLATE,
+    ("arch", True): _ARCHITECT_TEMPLATE,
+    ("default", False): _DEFAULT_INSPECTION_TEMPLATE,
+    ("default", True): _DEFAULT_PLAN_REVIEW_TEMPLATE,
+}
+
+
+@lru_cache(maxsize=512)
+def _classify_role(role: str) -> str:
+    """Bucket a CW company role for body selection: "gc" | "dev" | "arch" | "default"."""
+    if _role_is_gc_or_cm(role):
+        return "gc"
+    if _role_is_developer_or_owner(role):
+        return "dev"
+    if _role_is_architect(role):
+        return "arch"
+    return "default"
+
+
 def _generate_email_body(
     contact_name: str, company: str, role: str, project_name: str,
     service_focus: str = "Inspection",
@@ -785,277 +1316,93 @@ def _generate_email_body(
     """
     first = _first_name(contact_name)
     salutation = f"Hi {first}," if first else "Hi,"
-    is_plan_review_focus = "Plan Review" in service_focus and not _role_is_gc_or_cm(role)
-
-    bullet_expertise = (
-        "Multi-Discipline Expertise: Our team brings together licensed Professional Engineers "
-        "across all major disciplines and multiple ICC Master Code Professionals (MCP). We handle "
-        "Building, Mechanical, Electrical, Plumbing, and Fire Protection code inspections and plan "
-        "review — and serve as a hands-on technical resource for code compliance questions, "
-        "providing professional guidance when issues arise."
-    )
-    bullet_scheduling = (
-        "Responsive Scheduling: We offer same-day or next-business-day inspection availability "
-        "to keep your project milestones on track."
-    )
-    bullet_billing = (
-        "Fair, Visit-Based Billing: Billing is based on actual visits completed — our fee is a "
-        "flat rate per inspection visit actually performed. You will never be billed based on an "
-        "upfront estimate. If your project wraps up in fewer inspections than projected, you pay "
-        "only for what was done."
-    )
+    template = _TEMPLATES[(_classify_role(role), "Plan Review" in service_focus)]
+    return template.format(salutation=salutation, company=company, project_name=project_name)
 
-    if _role_is_gc_or_cm(role):
-        # GC / CM: inspection pitch only, no plan review (rules § 0-C)
-        parts = [
-            salutation,
-            "",
-            f"I noticed {company} is working on {project_name} in Washington, DC and wanted "
-            f"to take a moment to introduce Building Code Consulting LLC (BCC) as a potential "
-            f"resource for your Third-Party Inspection needs.",
-            "",
-            f"BCC is a DC-based engineering firm focused exclusively on Washington, D.C. "
-            f"Third-Party Code Compliance Inspections. A few reasons {company} may find us "
-            f"a strong fit for this project:",
-            "",
-            bullet_expertise,
-            "",
-            bullet_scheduling,
-            "",
-            bullet_billing,
-            "",
-            "We are not submitting a formal proposal at this stage, but if you are still "
-            "finalizing your inspection vendor list for this project, we would welcome the "
-            "opportunity to provide a competitive quote.",
-            "",
-            "Are you open to a quick 5-minute call or a brief capability overview?",
-        ]
 
-    elif _role_is_developer_or_owner(role):
-        if is_plan_review_focus:
-            # Early-stage Developer/Owner: lead with Plan Review
-            parts = [
-                salutation,
-                "",
-                f"I came across {project_name} and wanted to briefly introduce Building Code "
-                f"Consulting LLC (BCC) as a resource for {company}'s Third-Party Plan Review "
-                f"and Code Compliance Inspection needs.",
-                "",
-                f"BCC is a DC-based firm specializing in Third-Party Plan Review and Code "
-                f"Compliance Inspections. At this stage of the project, our plan review services "
-                f"can help identify and resolve code issues before submission — saving time and "
-                f"avoiding costly revision cycles. A few highlights:",
-                "",
-                bullet_expertise,
-                "",
-                "Plan Review Services: We provide expedited Third-Party Plan Review for DC and "
-                "nationwide jurisdictions. Our reviews identify code deficiencies before "
-                "submission, reducing agency review cycles and keeping your schedule on track.",
-                "",
-                bullet_billing,
-                "",
-                f"We are not submitting a formal proposal at this stage, but if you would like "
-                f"to learn more about how BCC can support {project_name} through plan review or "
-                f"future inspections, we would welcome the conversation.",
-                "",
-                "Are you open to a quick 5-minute call?",
-            ]
-        else:
-            # Later-stage Developer/Owner: lead with Inspections, note plan review
-            parts = [
-                salutation,
-                "",
-                f"I came across {project_name} and wanted to briefly introduce Building Code "
-                f"Consulting LLC (BCC) as a resource for {company}'s Third-Party Inspection "
-                f"and Plan Review needs.",
-                "",
-                f"BCC is a DC-based firm specializing in Third-Party Code Compliance Inspections "
-                f"and Plan Review. A few highlights:",
-                "",
-                bullet_expertise,
-                "",
-                bullet_scheduling,
-                "",
-                bullet_billing,
-                "",
-                "Also, as a quick note — BCC also offers Third-Party Plan Review Services for DC "
-                "and nationwide jurisdictions. If your team needs expedited pre-submission code "
-                "review or peer review, we would be glad to assist.",
-                "",
-                f"We are not submitting a formal proposal at this stage, but if you would like to "
-                f"learn more about our services for {project_name}, we would welcome the conversation.",
-                "",
-                "Are you open to a quick 5-minute call?",
-            ]
-
-    elif _role_is_architect(role):
-        # Architect pitch — Plan Review ONLY. Drop visit-billing (not their cost),
-        # drop generic "schedule" language, lead with DOB deficiency pain.
-        parts = [
-            salutation,
-            "",
-            f"Quick note on {project_name} — I'm with Building Code Consulting LLC (BCC), "
-            f"a DC firm that does Third-Party Plan Review for architects. Wanted to flag us "
-            f"as a resource before {company} submits to DOB.",
-            "",
-            "Most of the value for architects is catching code issues before they come back "
-            "as DOB deficiency comments:",
-            "",
-            "• Pre-submission peer review across all five disciplines — Building, Mechanical, "
-            "Electrical, Plumbing, Fire Protection. Our team has licensed PEs in each + "
-            "multiple ICC Master Code Professionals.",
-            "",
-            "• Expedited turnaround — we typically return mark-ups in days, not weeks, so "
-            "your permit path doesn't slip while waiting on us.",
-            "",
-            "• Gap-coverage for disciplines your sub-consultants don't carry (e.g., fire "
-            "protection on smaller projects). We seal what's needed.",
-            "",
-            f"Not pitching a formal engagement here — just wanted you to know we're available "
-            f"if DOB push-back on {project_name} becomes a schedule risk, or if a second set "
-            f"of eyes before submittal would be useful.",
-            "",
-            "Worth a 10-minute call to walk through a recent DC project we reviewed?",
-        ]
+# DC Government exclusion filter (BCC_PROPOSAL_RULES.md § 0-H)
+_GOV_EMAIL_DOMAINS = {"dc.gov", "wmata.com"}
+_GOV_COMPANY_KEYWORDS = [
+    "government of the district of columbia", "district of columbia",
+    "dmped", "office of the deputy mayor", "department of general services",
+    "department of buildings", "office of contracting and procurement",
+    "dc public schools", "dcps", "dc housing authority", "dcha", "wmata",
+]
 
-    else:
-        # Default: conservative pitch based on stage focus
-        if is_plan_review_focus:
-            parts = [
-                salutation,
-                "",
-                f"I came across {project_name} and wanted to briefly introduce Building Code "
-                f"Consulting LLC (BCC) as a resource for Third-Party Plan Review and Inspection needs.",
-                "",
-                "BCC is a DC-based engineering firm specializing in Washington, D.C. Third-Party "
-                "Code Compliance Plan Review and Inspections. A few reasons we may be a strong fit:",
-                "",
-                bullet_expertise,
-                "",
-                "Plan Review Services: We offer expedited Third-Party Plan Review for DC and "
-                "nationwide jurisdictions — helping identify code issues before submission.",
-                "",
-                bullet_billing,
-                "",
-                "We are not submitting a formal proposal at this stage, but if you are exploring "
-                "plan review or inspection resources for this project, we would welcome a brief conversation.",
-                "",
-                "Are you open to a quick 5-minute call?",
-            ]
-        else:
-            parts = [
-                salutation,
-                "",
-                f"I came across {project_name} and wanted to briefly introduce Building Code "
-                f"Consulting LLC (BCC) as a potential resource for Third-Party Inspection needs.",
-                "",
-                "BCC is a DC-based engineering firm specializing in Washington, D.C. Third-Party "
-                "Code Compliance Inspections. A few reasons we may be a strong fit:",
-                "",
-                bullet_expertise,
-                "",
-                bullet_scheduling,
-                "",
-                bullet_billing,
-                "",
-                "We are not submitting a formal proposal at this stage, but if you are exploring "
-                "inspection vendors for this project, we would welcome a brief conversation.",
-                "",
-                "Are you open to a quick 5-minute call?",
-            ]
-
-    return "\n".join(parts)
 
+def _is_dc_government(email_addr: str, company: str) -> bool:
+    """Return True if contact is a DC Government entity (skip per § 0-H)."""
+    domain = email_addr.lower().split("@")[-1] if "@" in email_addr else ""
+    if domain in _GOV_EMAIL_DOMAINS:
+        return True
+    comp_lower = company.lower()
+    return any(kw in comp_lower for kw in _GOV_COMPANY_KEYWORDS)
 
-def phase5_generate_emails(
-    leads: list[dict], company_research: dict[str, dict]
-) -> list[dict]:
-    """
-    Generate one cold outreach email per (project, company, contact).
-    Subject: "Third-Party Inspection Services for [Project] | Building Code Consulting LLC"
-    No "bid inquiry", no "Proposal" language, no signature.
-    Returns list of email dicts.
-    """
-    print(f"\n{'='*60}")
-    print("Phase 5: Generating Cold Outreach Emails")
-    print(f"{'='*60}")
 
-    # Load sent_log to avoid re-contacting anyone emailed in the last 60 days
-    import csv as _csv
-    from datetime import timedelta as _td
-    _recently_emailed: set[str] = set()
-    _cutoff = datetime.now() - _td(days=60)
-    try:
-        with open(BASE_DIR / "sent_log.csv", newline="", encoding="utf-8") as _f:
-            for row in _csv.DictReader(_f):
-                _ts_str = row.get("sent_at") or row.get("followup_sent_at") or ""
-                try:
-                    from datetime import timezone as _tz
-                    _ts = datetime.fromisoformat(_ts_str.replace("Z", "+00:00"))
-                    if _ts.tzinfo:
-                        _ts = _ts.replace(tzinfo=None)  # make naive for comparison
-                except Exception:
-                    _ts = None
-                if _ts and _ts >= _cutoff:
-                    _recently_emailed.add((row.get("contact_email") or "").strip().lower())
-    except FileNotFoundError:
-        pass
-    if _recently_emailed:
-        print(f"  Dedup: {len(_recently_emailed)} contacts emailed in the last 60 days — will skip.")
+# Phase 5 fans out to a process pool above this many leads; below it the pool
+# start-up (and pickling company_research) costs more than it saves.
+PHASE5_PARALLEL_MIN_LEADS = 200
+
+# Per-process read-only state for Phase 5 pool workers (set by _phase5_init)
+_p5_company_research: dict[str, dict] = {}
+_p5_recently_emailed: set[str] = set()
 
-    emails: list[dict] = []
-    seen: set[tuple[str, str]] = set()  # (email_lower, project)
-
-    # DC Government exclusion filter (BCC_PROPOSAL_RULES.md § 0-H)
-    _GOV_EMAIL_DOMAINS = {"dc.gov", "wmata.com"}
-    _GOV_COMPANY_KEYWORDS = [
-        "government of the district of columbia", "district of columbia",
-        "dmped", "office of the deputy mayor", "department of general services",
-        "department of buildings", "office of contracting and procurement",
-        "dc public schools", "dcps", "dc housing authority", "dcha", "wmata",
-    ]
 
-    def _is_dc_government(email_addr: str, company: str) -> bool:
-        """Return True if contact is a DC Government entity (skip per § 0-H)."""
-        domain = email_addr.lower().split("@")[-1] if "@" in email_addr else ""
-        if domain in _GOV_EMAIL_DOMAINS:
-            return True
-        comp_lower = company.lower()
-        return any(kw in comp_lower for kw in _GOV_COMPANY_KEYWORDS)
+def _phase5_init(company_research: dict[str, dict], recently_emailed: set[str]) -> None:
+    global _p5_company_research, _p5_recently_emailed
+    _p5_company_research = company_research
+    _p5_recently_emailed = recently_emailed
 
-    _gov_skipped = 0
-    _title_skipped = 0
 
-    def _add_email(project_name: str, company: str, role: str,
+def _phase5_worker(shard: list[tuple]) -> tuple[list[tuple[int, dict | str]], int, int]:
+    return _generate_for_shard(shard, _p5_company_research, _p5_recently_emailed)
+
+
+def _generate_for_shard(
+    shard: list[tuple[int, dict, list[tuple[str, str, str, str]]]],
+    company_research: dict[str, dict],
+    recently_emailed: set[str],
+) -> tuple[list[tuple[int, dict | str]], int, int]:
+    """
+    Generate drafts for a shard of (lead_idx, lead, cw_rows) in lead order.
+    cw_rows: (company, name, role, email) of the lead's CW detail-page contacts.
+    Dedup is per project, so a shard must hold every lead of the projects it covers.
+    Returns (events, gov_skipped, title_skipped); events are (lead_idx, email dict
+    or log line) in the order the serial loop would have produced them.
+    """
+    events: list[tuple[int, dict | str]] = []
+    seen_by_project: defaultdict[str, set[str]] = defaultdict(set)  # project -> {email_lower}
+    gov_skipped = 0
+    title_skipped = 0
+
+    def _add_email(li: int, project_name: str, company: str, role: str,
                    contact_name: str, contact_role: str, email_addr: str, phone: str,
                    service_focus: str = "Inspection") -> None:
-        nonlocal _gov_skipped, _title_skipped
-        key = (email_addr.lower(), project_name)
-        if key in seen:
+        nonlocal gov_skipped, title_skipped
+        email_lc = email_addr.lower()
+        seen = seen_by_project[project_name]
+        if email_lc in seen:
             return
         # Skip DC Government contacts (rules § 0-H)
         if _is_dc_government(email_addr, company):
-            _gov_skipped += 1
-            print(f"  [SKIPPED — DC GOV] {company} / {contact_name} <{email_addr}>")
+            gov_skipped += 1
+            events.append((li, f"  [SKIPPED — DC GOV] {company} / {contact_name} <{email_addr}>"))
             return
         # Skip contacts whose title is on the blacklist / not on the whitelist (2026-04-24)
         ok, reason = _title_is_valid_target(contact_role)
         if not ok:
-            _title_skipped += 1
-            print(f"  [SKIPPED — TITLE] {company} / {contact_name} ({contact_role}): {reason}")
+            title_skipped += 1
+            events.append((li, f"  [SKIPPED — TITLE] {company} / {contact_name} ({contact_role}): {reason}"))
             return
         # Skip contacts we've already emailed in the past 60 days
-        if email_addr.lower() in _recently_emailed:
+        if email_lc in recently_emailed:
             return
-        seen.add(key)
+        seen.add(email_lc)
         # Subject: short, role-specific, ≤ 55 chars so it survives mobile truncation
         #   Architects  → "Plan Review for {Project} — BCC"
         #   GC/CM       → "TPI Inspector for {Project} — BCC"
         #   Owner (PR)  → "Plan Review + TPI for {Project} — BCC"
         #   Owner (TPI) → "TPI Inspector for {Project} — BCC"
-        def _truncate_project(p: str, limit: int) -> str:
-            return p if len(p) <= limit else p[: max(1, limit - 1)].rstrip() + "…"
-
         if _role_is_architect(role):
             subject = f"Plan Review for {_truncate_project(project_name, 35)} — BCC"
         elif _role_is_gc_or_cm(role):
@@ -1065,9 +1412,13 @@ def phase5_generate_emails(
         else:
             subject = f"TPI Inspector for {_truncate_project(project_name, 33)} — BCC"
         body = _generate_email_body(contact_name, company, role, project_name, service_focus)
-        safe_slug = re.sub(r"[^\w]", "_", f"{company}_{contact_name or 'Contact'}")[:48]
-        safe_slug = re.sub(r"_+", "_", safe_slug).strip("_")
-        emails.append({
+        raw_slug = f"{company}_{contact_name or 'Contact'}"
+        if raw_slug.isascii():
+            raw_slug = raw_slug.translate(_SLUG_TABLE)
+        else:
+            raw_slug = _NONWORD_RE.sub("_", raw_slug)
+        safe_slug = _UNDERSCORES_RE.sub("_", raw_slug[:48]).strip("_")
+        events.append((li, {
             "slug": safe_slug,
             "project": project_name,
             "company": company,
@@ -1078,28 +1429,21 @@ def phase5_generate_emails(
             "phone": phone,
             "subject": subject,
             "body": body,
-        })
+        }))
 
-    for lead in leads:
+    for li, lead, cw_rows in shard:
         project_name = (lead.get("project_name") or "").strip()
-        if not project_name:
-            continue
-
         stage_text = lead.get("stage") or lead.get("construction_start") or ""
         service_focus, _ = _stage_service_focus(stage_text)
 
         # ── Source 1: CW detail-page contacts (highest quality — verified emails) ──
-        for dc in lead.get("detail_contacts", []):
-            email_addr = (dc.get("email") or "").strip()
+        for company, name, role, email_addr in cw_rows:
             if not email_addr or "@" not in email_addr:
                 continue
-            company = _clean_company_name(dc.get("company") or "")
             if not company:
                 continue
-            contact_name = (dc.get("name") or "").strip()
-            role = (dc.get("role") or "").strip()
             role_mapped = _map_cw_role(role)
-            _add_email(project_name, company, role_mapped, contact_name, role, email_addr, "", service_focus)
+            _add_email(li, project_name, company, role_mapped, name, role, email_addr, "", service_focus)
 
         # ── Source 2: Deep-search contacts for companies in companies_parsed ──
         for (company, role) in lead.get("companies_parsed", []):
@@ -1111,7 +1455,87 @@ def phase5_generate_emails(
                 contact_name = (contact.get("name") or "").strip()
                 contact_role = (contact.get("role") or role).strip()
                 phone = (contact.get("phone") or "").strip()
-                _add_email(project_name, company, role, contact_name, contact_role, email_addr, phone, service_focus)
+                _add_email(li, project_name, company, role, contact_name, contact_role, email_addr, phone, service_focus)
+
+    return events, gov_skipped, title_skipped
+
+
+def phase5_generate_emails(
+    leads: list[dict], company_research: dict[str, dict], cols: LeadsColumns | None = None
+) -> list[dict]:
+    """
+    Generate one cold outreach email per (project, company, contact).
+    Subject: "Third-Party Inspection Services for [Project] | Building Code Consulting LLC"
+    No "bid inquiry", no "Proposal" language, no signature.
+    Above PHASE5_PARALLEL_MIN_LEADS leads, projects are sharded across a process
+    pool; the merged result is identical to the serial run.
+    Returns list of email dicts.
+    """
+    print(f"\n{'='*60}")
+    print("Phase 5: Generating Cold Outreach Emails")
+    print(f"{'='*60}")
+
+    # Load sent_log to avoid re-contacting anyone emailed in the last 60 days
+    _recently_emailed: set[str] = set()
+    _cutoff = datetime.now() - timedelta(days=60)
+    try:
+        with open(BASE_DIR / "sent_log.csv", newline="", encoding="utf-8") as _f:
+            for row in csv.DictReader(_f):
+                _ts_str = row.get("sent_at") or row.get("followup_sent_at") or ""
+                try:
+                    _ts = datetime.fromisoformat(_ts_str.replace("Z", "+00:00"))
+                    if _ts.tzinfo:
+                        _ts = _ts.replace(tzinfo=None)  # make naive for comparison
+                except Exception:
+                    _ts = None
+                if _ts and _ts >= _cutoff:
+                    _recently_emailed.add((row.get("contact_email") or "").strip().lower())
+    except FileNotFoundError:
+        pass
+    if _recently_emailed:
+        print(f"  Dedup: {len(_recently_emailed)} contacts emailed in the last 60 days — will skip.")
+
+    if cols is None:
+        cols = _build_leads_columns(leads)
+    items: list[tuple[int, dict, list[tuple[str, str, str, str]]]] = []
+    for li, lead in enumerate(leads):
+        if not (lead.get("project_name") or "").strip():
+            continue
+        cw_rows = [(cols.company[k], cols.name[k], cols.role[k], cols.email[k]) for k in cols.rows(li)]
+        items.append((li, lead, cw_rows))
+
+    n_workers = min(os.cpu_count() or 1, 8)
+    if len(leads) > PHASE5_PARALLEL_MIN_LEADS and n_workers > 1:
+        # Shard by project so each project's dedup set lives in one worker;
+        # projects go to the currently smallest shard to keep work balanced.
+        by_project: dict[str, list[tuple]] = defaultdict(list)
+        for item in items:
+            by_project[item[1]["project_name"].strip()].append(item)
+        shards: list[list[tuple]] = [[] for _ in range(n_workers)]
+        for group in sorted(by_project.values(), key=len, reverse=True):
+            min(shards, key=len).extend(group)
+        shards = [sorted(sh, key=lambda it: it[0]) for sh in shards if sh]
+        with ProcessPoolExecutor(
+            max_workers=len(shards),
+            initializer=_phase5_init,
+            initargs=(company_research, _recently_emailed),
+        ) as pool:
+            results = list(pool.map(_phase5_worker, shards))
+        # Each lead lives in exactly one shard, so merging on lead index restores serial order
+        events = list(heapq.merge(*(r[0] for r in results), key=lambda ev: ev[0]))
+        _gov_skipped = sum(r[1] for r in results)
+        _title_skipped = sum(r[2] for r in results)
+    else:
+        events, _gov_skipped, _title_skipped = _generate_for_shard(
+            items, company_research, _recently_emailed
+        )
+
+    emails: list[dict] = []
+    for _, ev in events:
+        if isinstance(ev, str):
+            print(ev)
+        else:
+            emails.append(ev)
 
     if _gov_skipped:
         print(f"  DC Government contacts skipped: {_gov_skipped} (per § 0-H)")
@@ -1122,27 +1546,33 @@ def phase5_generate_emails(
 
 
 # ─── Phase 6: Save drafts ──────────────────────────────────────────────────────
-def phase6_save_drafts(email_drafts: list[dict]) -> list[Path]:
+def _draft_without_stamp(text: str) -> str:
+    """Draft text minus its "# Generated:" line (line 2), for unchanged-draft checks."""
+    title, _, rest = text.partition("\n")
+    return title + "\n" + rest.partition("\n")[2]
+
+
+def phase6_save_drafts(email_drafts: list[dict], now_str: str = NOW_STR) -> list[Path]:
     """
     Save each email as CW_[slug]_[TIMESTAMP].md in Pending_Approval/Outbound/.
-    Cleans up old CW_*.md drafts first.
+    Cleans up old CW_*.md drafts first. Deletes and writes run on a small thread pool.
+    now_str: the run timestamp, so --resume reruns target the same file names; a draft
+    whose file already holds the same content (ignoring the Generated stamp) is left
+    untouched, keeping its mtime for send_cw_outreach's parse cache.
     """
     print(f"\n{'='*60}")
     print("Phase 6: Saving Email Drafts")
     print(f"{'='*60}")
 
-    # Clean up previous CW pipeline drafts
-    for old in OUTBOUND_DIR.glob("CW_*.md"):
-        old.unlink()
-        print(f"  Deleted old draft: {old.name}")
-
     saved: list[Path] = []
+    contents: dict[Path, str] = {}  # colliding slugs: last draft wins, as with serial writes
+    generated_str = datetime.now().strftime("%Y-%m-%d %H:%M")
     for em in email_drafts:
-        fname = f"CW_{em['slug']}_{NOW_STR}.md"
+        fname = f"CW_{em['slug']}_{now_str}.md"
         fpath = OUTBOUND_DIR / fname
         content = (
             f"# CW Cold Outreach — {em['company']}\n"
-            f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
+            f"# Generated: {generated_str}\n\n"
             f"**PROJECT:** {em['project']}\n"
             f"**TO:** {em['contact_name']} <{em['to_email']}>\n"
             f"**PHONE:** {em['phone'] or '—'}\n"
@@ -1153,11 +1583,42 @@ def phase6_save_drafts(email_drafts: list[dict]) -> list[Path]:
             f"---\n\n"
             f"{em['body']}\n"
         )
-        fpath.write_text(content, encoding="utf-8")
+        contents[fpath] = content
         saved.append(fpath)
-        print(f"  Saved: {fname}")
 
-    print(f"Phase 6 complete: {len(saved)} drafts saved to Pending_Approval/Outbound/")
+    # Clean up previous CW pipeline drafts. Ones this run writes again (same name) are
+    # overwritten in place instead, or skipped entirely if their content is unchanged.
+    with os.scandir(OUTBOUND_DIR) as it:
+        old_drafts = sorted(
+            (e for e in it if e.name.startswith("CW_") and e.name.endswith(".md")),
+            key=lambda e: e.name,
+        )
+    unchanged: set[Path] = set()
+    stale: list[os.DirEntry] = []
+    for old in old_drafts:
+        new = contents.get(Path(old.path))
+        if new is not None:
+            try:
+                old_text = Path(old.path).read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                old_text = ""
+            if _draft_without_stamp(old_text) == _draft_without_stamp(new):
+                unchanged.add(Path(old.path))
+            continue
+        stale.append(old)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(os.unlink, (old.path for old in stale)))
+    for old in stale:
+        print(f"  Deleted old draft: {old.name}")
+
+    to_write = [(fp, c) for fp, c in contents.items() if fp not in unchanged]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda pc: pc[0].write_text(pc[1], encoding="utf-8"), to_write))
+    for fpath in saved:
+        print(f"  {'Unchanged' if fpath in unchanged else 'Saved'}: {fpath.name}")
+
+    print(f"Phase 6 complete: {len(saved)} drafts saved to Pending_Approval/Outbound/"
+          + (f" ({len(unchanged)} unchanged)" if unchanged else ""))
     return saved
 
 
@@ -1168,19 +1629,17 @@ def phase7_send_drafts_telegram(email_drafts: list[dict], saved_paths: list[Path
     When > 20 drafts, skip individual previews (too many for Telegram rate limits).
     Drafts are reviewed locally via the Top-100 file + send_cw_outreach.py.
     """
-    import time
-
     print(f"\n{'='*60}")
     print("Phase 7: Sending Email Drafts Summary to Telegram")
     print(f"{'='*60}")
 
-    by_company: dict[str, list[dict]] = {}
+    by_company: defaultdict[str, list[dict]] = defaultdict(list)
     for em in email_drafts:
-        by_company.setdefault(em["company"], []).append(em)
+        by_company[em["company"]].append(em)
 
     # Build compact company list (max 50 lines to stay under TG limit)
     lines = []
-    for company, ems in sorted(by_company.items())[:50]:
+    for company, ems in heapq.nsmallest(50, by_company.items(), key=lambda kv: kv[0]):
         contacts = ", ".join(e["contact_name"] for e in ems if e["contact_name"])
         lines.append(f"• {company}: {contacts or '(no name)'}")
     company_list = "\n".join(lines)
@@ -1201,16 +1660,16 @@ def phase7_send_drafts_telegram(email_drafts: list[dict], saved_paths: list[Path
     # Only send individual previews if count is small enough
     MAX_INDIVIDUAL_PREVIEWS = 15
     if len(email_drafts) <= MAX_INDIVIDUAL_PREVIEWS:
-        for em, fpath in zip(email_drafts, saved_paths):
-            preview = (
-                f"📨 *{em['company']}* ({em['company_role']})\n"
-                f"Project: {em['project']}\n"
-                f"To: {em['contact_name']} <{em['to_email']}>"
-                + (f"\nPhone: {em['phone']}" if em["phone"] else "")
-                + f"\nSubject: {em['subject']}\n\n---\n{em['body'][:600]}"
-            )
-            tg_message(preview)
-            time.sleep(1.5)  # stay well under Telegram rate limits
+        # Packed into as few 4096-char messages as possible (one POST per chunk)
+        previews = [
+            f"📨 *{em['company']}* ({em['company_role']})\n"
+            f"Project: {em['project']}\n"
+            f"To: {em['contact_name']} <{em['to_email']}>"
+            + (f"\nPhone: {em['phone']}" if em["phone"] else "")
+            + f"\nSubject: {em['subject']}\n\n---\n{em['body'][:300]}"
+            for em in email_drafts
+        ]
+        tg_messages(previews)
 
     print(f"Phase 7 complete: summary sent. {len(email_drafts)} drafts ready locally.")
 
@@ -1233,6 +1692,8 @@ def main() -> int:
     ap.add_argument("--resume",     action="store_true", help="Resume from last saved checkpoint")
     ap.add_argument("--from-phase", type=int, default=0, metavar="N",
                     help="Skip to phase N using checkpoint data (1=scrape…7=tg-drafts)")
+    ap.add_argument("--resume-from", metavar="LEADS_JSON", default="",
+                    help="Skip Phase 1 and load leads from a saved cw_leads_raw_*.json")
     ap.add_argument("--status",     action="store_true", help="Show checkpoint status and exit")
     ap.add_argument("--clear-checkpoint", action="store_true", help="Delete checkpoint file and exit")
     args = ap.parse_args()
@@ -1287,6 +1748,17 @@ def main() -> int:
     # Preserve the original timestamp across resume runs (keeps file names consistent)
     now_str = cp.get("now_str", NOW_STR)
 
+    if args.resume_from:
+        if not Path(args.resume_from).exists():
+            print(f"ERROR: --resume-from file not found: {args.resume_from}")
+            return 1
+        resume_from = max(resume_from, 2)
+        _checkpoint_save({
+            "now_str": now_str,
+            "phase1_done": True,
+            "phase1_leads_file": str(Path(args.resume_from).resolve()),
+        })
+
     if resume_from == 1:
         # Fresh run: initialize checkpoint with args
         _checkpoint_save({
@@ -1306,17 +1778,19 @@ def main() -> int:
             print("No leads found. Exiting.")
             return 1
         raw_path = BASE_DIR / f"cw_leads_raw_{now_str}.json"
-        raw_path.write_text(json.dumps(leads, ensure_ascii=False, indent=2), encoding="utf-8")
+        _json_dump_atomic(raw_path, leads)
         print(f"Raw leads JSON: {raw_path.name}")
         _checkpoint_save({"phase1_done": True, "phase1_leads_file": str(raw_path)})
     else:
-        leads_file = cp.get("phase1_leads_file", "")
+        leads_file = args.resume_from or cp.get("phase1_leads_file", "")
         if not leads_file or not Path(leads_file).exists():
             print("ERROR: Checkpoint phase1_leads_file missing or gone. Run without --resume.")
             return 1
-        leads = json.loads(Path(leads_file).read_text(encoding="utf-8"))
+        leads = _json_load(Path(leads_file))
         print(f"[RESUME] Phase 1: {len(leads)} leads loaded from {Path(leads_file).name}")
 
+    cols = _build_leads_columns(leads)
+
     # ── Phase 2: Research ─────────────────────────────────────────────────────
     if resume_from <= 2:
         if args.skip_research:
@@ -1345,7 +1819,7 @@ def main() -> int:
             skip_cos = set(cp.get("phase2_researched", [])) if resume_from == 2 else set()
             company_research = phase2_research_companies(
                 leads, max_contacts=args.max_contacts,
-                existing_research=existing, skip_companies=skip_cos,
+                existing_research=existing, skip_companies=skip_cos, cols=cols,
             )
         _checkpoint_save({"phase2_done": True, "phase2_company_research": company_research})
     else:
@@ -1354,13 +1828,11 @@ def main() -> int:
 
     # ── Phase 3: Report + Top-100 ─────────────────────────────────────────────
     if resume_from <= 3:
-        report_md = phase3_compile_report(leads, company_research)
         report_path = BASE_DIR / f"DC_Leads_Report_{now_str}.md"
-        report_path.write_text(report_md, encoding="utf-8")
+        report_md = phase3_compile_report(leads, company_research, report_path)
         print(f"\nReport saved: {report_path.name}")
-        summary_end = report_md.find("## Detailed Contacts per Project")
         print("\n" + ("=" * 60))
-        print(report_md[:summary_end] if summary_end > 0 else report_md[:2000])
+        print(report_md)
 
         top100_md = phase_rank_top100(leads, company_research)
         top100_path = BASE_DIR / f"DC_Top100_{now_str}.md"
@@ -1375,7 +1847,8 @@ def main() -> int:
     else:
         report_path = Path(cp.get("phase3_report_file", ""))
         top100_path = Path(cp.get("phase3b_top100_file", ""))
-        report_md = report_path.read_text(encoding="utf-8") if report_path.exists() else ""
+        # Phase 4 only needs the summary: rebuild it from leads instead of reading the full report
+        report_md = _compile_report_summary(leads) if report_path.exists() else ""
         print(f"[RESUME] Phase 3: report={report_path.name}, top100={top100_path.name}")
 
     # ── Phase 4: Telegram report ──────────────────────────────────────────────
@@ -1391,7 +1864,7 @@ def main() -> int:
 
     # ── Phase 5: Generate emails ──────────────────────────────────────────────
     if resume_from <= 5:
-        email_drafts = phase5_generate_emails(leads, company_research)
+        email_drafts = phase5_generate_emails(leads, company_research, cols)
         if not email_drafts:
             print("\nNo email drafts generated (no contacts with emails found).")
             print("Tip: Run without --skip-research or check CW detail pages have contacts.")
@@ -1400,12 +1873,12 @@ def main() -> int:
         _checkpoint_save({"phase5_done": True, "phase5_email_count": len(email_drafts)})
     else:
         # Re-generate emails from loaded data (drafts may have been deleted)
-        email_drafts = phase5_generate_emails(leads, company_research)
+        email_drafts = phase5_generate_emails(leads, company_research, cols)
         print(f"[RESUME] Phase 5: {len(email_drafts)} emails re-generated from checkpoint data")
 
     # ── Phase 6: Save drafts ──────────────────────────────────────────────────
     if resume_from <= 6:
-        saved_paths = phase6_save_drafts(email_drafts)
+        saved_paths = phase6_save_drafts(email_drafts, now_str)
         _checkpoint_save({"phase6_done": True})
     else:
         saved_paths = sorted(OUTBOUND_DIR.glob("CW_*.md"))
@@ -22,18 +22,16 @@ def phase1_extract():
 def phase2_generate_and_audit(max_loops=3):
     sys.path.insert(0, str(BASE_DIR))
     from internal_audit_proposal import audit
+    from regenerate_st_josephs_proposal import regenerate
     for attempt in range(max_loops):
-        # Generate
-        import subprocess
-        r = subprocess.run(
-            [sys.executable, str(BASE_DIR / "regenerate_st_josephs_proposal.py")],
-            cwd=str(BASE_DIR),
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-        if r.returncode != 0:
-            print("[Phase 2] Generate failed:", r.stderr or r.stdout)
+        # Generate (in-process: no interpreter start-up / docx re-import per retry)
+        try:
+            rc = regenerate()
+        except Exception as e:
+            print("[Phase 2] Generate failed:", e)
+            continue
+        if rc != 0:
+            print("[Phase 2] Generate failed: regenerate_st_josephs_proposal returned", rc)
             continue
         if not OUT_DOCX.exists():
             alt = OUT_DOCX.parent / (OUT_DOCX.stem + " - CORRECTED.docx")
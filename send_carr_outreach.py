@@ -1,10 +1,11 @@
 """
-发送 Carr Properties 开发信：读取 Carr_Outreach_Draft.md，使用 admin@ 发送给 Austen Holderness，抄送 ycao@。
+发送 Carr Properties 开发信：正文为下方 BODY（定稿自 Carr_Outreach_Draft.md），使用 admin@ 发送给 Austen Holderness，抄送 ycao@。
 仅在用户确认「Proceed with sending」后执行。发送后写入 sent_log.csv 记录状态。
 """
 import csv
 import os
 import re
+from datetime import datetime, timezone
 from pathlib import Path
 
 try:
@@ -17,7 +18,6 @@ except ImportError:
 from email_sender import send_from_admin
 
 BASE_DIR = Path(__file__).resolve().parent
-DRAFT_PATH = BASE_DIR / "Carr_Outreach_Draft.md"
 SENT_LOG = BASE_DIR / "sent_log.csv"
 
 TO_EMAIL = "aholderness@carrprop.com"
@@ -49,21 +49,16 @@ def log_sent(contact_email: str, contact_name: str, company: str, subject: str):
         w = csv.writer(f)
         if write_header:
             w.writerow(["contact_email", "contact_name", "company", "subject", "sent_at"])
-        from datetime import datetime
-        w.writerow([contact_email, contact_name, company, subject, datetime.utcnow().isoformat() + "Z"])
+        w.writerow([contact_email, contact_name, company, subject, datetime.now(timezone.utc).isoformat()])
 
 
 def main():
-    if not DRAFT_PATH.exists():
-        print("未找到 Carr_Outreach_Draft.md")
+    # 最终检查：无重复签名、项目引用正确（直接检查实际发送的 BODY，不再读取草稿文件）
+    if BODY.count("Kyle Cao, PE, MCP") > 1:
+        print("检测到正文中签名出现多次，请检查 BODY。")
         return 1
-    # 最终检查：无重复签名、项目引用正确
-    text = DRAFT_PATH.read_text(encoding="utf-8")
-    if text.count("Kyle Cao, PE, MCP") > 1:
-        print("检测到正文中签名出现多次，请检查草稿。")
-        return 1
-    if "2121 Virginia" not in text and "2121 Virginia Ave" not in text:
-        print("未在草稿中看到 2121 Virginia Ave 项目引用，请确认。")
+    if "2121 Virginia" not in BODY:
+        print("未在正文中看到 2121 Virginia Ave 项目引用，请确认。")
         return 1
 
     ok, msg = send_from_admin(TO_EMAIL, SUBJECT, BODY)
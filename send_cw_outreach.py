@@ -10,14 +10,18 @@ Usage:
     python send_cw_outreach.py --all          # confirm all at once (still asks once)
     python send_cw_outreach.py --dry-run      # show what would be sent, no actual send
     python send_cw_outreach.py --company "Turner"  # filter by company name substring
+    python send_cw_outreach.py --all --parallel 4  # 4 concurrent SMTP connections
 """
 from __future__ import annotations
 
 import argparse
 import csv
+import json
 import os
-import re
 import sys
+import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -27,11 +31,22 @@ try:
 except ImportError:
     pass
 
-from email_sender import send_from_admin, send_from_admin_with_attachment
-
 BASE_DIR = Path(__file__).resolve().parent
 OUTBOUND_DIR = BASE_DIR / "Pending_Approval" / "Outbound"
 SENT_LOG = BASE_DIR / "sent_log.csv"
+LOG_FLUSH_EVERY = 10  # sent_log.csv rows buffered per append
+# Parsed drafts keyed by "<name>:<mtime_ns>" so reruns (e.g. tweaking --company) skip re-parsing
+DRAFTS_CACHE_PATH = BASE_DIR / ".cache" / "cw_drafts.json"
+
+
+# Draft header line prefixes (as written by run_cw_leads_pipeline Phase 6) → field key
+_HEADER_FIELDS = (
+    ("**TO:**", "to"),
+    ("**SUBJECT:**", "subject"),
+    ("**PROJECT:**", "project"),
+    ("**PHONE:**", "phone"),
+    ("# CW Cold Outreach — ", "company"),
+)
 
 
 def _parse_draft(fpath: Path) -> dict | None:
@@ -46,32 +61,35 @@ def _parse_draft(fpath: Path) -> dict | None:
         print(f"  Could not read {fpath.name}: {e}")
         return None
 
-    # Required fields
-    to_match = re.search(r"\*\*TO:\*\*\s*(.+?)(?:\n|$)", text)
-    subj_match = re.search(r"\*\*SUBJECT:\*\*\s*(.+?)(?:\n|$)", text)
-    project_match = re.search(r"\*\*PROJECT:\*\*\s*(.+?)(?:\n|$)", text)
-    company_match = re.search(r"# CW Cold Outreach — (.+?)(?:\n|$)", text)
-    phone_match = re.search(r"\*\*PHONE:\*\*\s*(.+?)(?:\n|$)", text)
+    # Header (field lines) and body are separated by the first "---\n\n"
+    header, sep, body = text.partition("---\n\n")
+    body = body.strip() if sep else ""
+
+    fields: dict[str, str] = {}
+    for line in header.splitlines():
+        for prefix, key in _HEADER_FIELDS:
+            if line.startswith(prefix):
+                value = line[len(prefix):].strip()
+                if value:
+                    fields.setdefault(key, value)
+                break
 
-    if not to_match or not subj_match:
+    to_raw = fields.get("to", "")
+    subject = fields.get("subject", "")
+    if not to_raw or not subject:
         return None
 
     # Parse name and email from "Contact Name <email@domain.com>"
-    to_raw = to_match.group(1).strip()
-    email_in_brackets = re.search(r"<(.+?)>", to_raw)
-    to_email = email_in_brackets.group(1).strip() if email_in_brackets else to_raw
-    contact_name = to_raw.split("<")[0].strip() if "<" in to_raw else ""
-
-    subject = subj_match.group(1).strip()
-    project = (project_match.group(1).strip() if project_match else "").strip()
-    company = (company_match.group(1).strip() if company_match else fpath.stem).strip()
-    phone = (phone_match.group(1).strip() if phone_match else "").strip()
+    name_part, lt, rest = to_raw.partition("<")
+    addr, gt, _ = rest.partition(">")
+    to_email = addr.strip() if lt and gt and addr else to_raw
+    contact_name = name_part.strip() if lt else ""
+
+    project = fields.get("project", "")
+    company = fields.get("company", fpath.stem)
+    phone = fields.get("phone", "")
     phone = "" if phone == "—" else phone
 
-    # Extract body: everything after "---\n\n"
-    body_split = text.split("---\n\n", 1)
-    body = body_split[1].strip() if len(body_split) > 1 else ""
-
     if not to_email or "@" not in to_email or not body:
         return None
 
@@ -87,21 +105,70 @@ def _parse_draft(fpath: Path) -> dict | None:
     }
 
 
-def _log_sent(em: dict) -> None:
-    """Append send record to sent_log.csv."""
+def _list_drafts() -> list[os.DirEntry]:
+    """CW_*.md files in OUTBOUND_DIR, sorted by name (DirEntry keeps the stat from scandir)."""
+    try:
+        with os.scandir(OUTBOUND_DIR) as it:
+            entries = [
+                e for e in it
+                if e.name.startswith("CW_") and e.name.endswith(".md") and e.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda e: e.name)
+    return entries
+
+
+def _parse_drafts_cached(drafts: list[os.DirEntry]) -> list[dict | None]:
+    """
+    _parse_draft for each draft, reusing results from DRAFTS_CACHE_PATH for files
+    whose mtime hasn't changed. The cache is rewritten with just the current drafts.
+    """
+    try:
+        cache = json.loads(DRAFTS_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+
+    fresh: dict[str, dict | None] = {}
+    results: list[dict | None] = []
+    for entry in drafts:
+        fpath = Path(entry.path)
+        key = f"{entry.name}:{entry.stat().st_mtime_ns}"
+        if key in cache:
+            em = cache[key] and {**cache[key], "file": fpath}
+        else:
+            em = _parse_draft(fpath)
+        fresh[key] = None if em is None else {**em, "file": str(fpath)}
+        results.append(em)
+
+    if fresh != cache:
+        try:
+            DRAFTS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp = DRAFTS_CACHE_PATH.with_name(DRAFTS_CACHE_PATH.name + ".tmp")
+            tmp.write_text(json.dumps(fresh, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, DRAFTS_CACHE_PATH)
+        except OSError:
+            pass
+    return results
+
+
+def _log_sent_batch(ems: list[dict]) -> None:
+    """Append send records to sent_log.csv with one open. Each em carries its own sent_at."""
+    if not ems:
+        return
     write_header = not SENT_LOG.exists()
     with open(SENT_LOG, "a", newline="", encoding="utf-8") as f:
         w = csv.writer(f)
         if write_header:
             w.writerow(["contact_email", "contact_name", "company", "project", "subject", "sent_at"])
-        w.writerow([
+        w.writerows([
             em["to_email"],
             em["contact_name"],
             em["company"],
             em["project"],
             em["subject"],
-            datetime.now(timezone.utc).isoformat(),
-        ])
+            em["sent_at"],
+        ] for em in ems)
 
 
 def main() -> int:
@@ -111,9 +178,11 @@ def main() -> int:
     ap.add_argument("--company", default="", help="Filter: only send for companies matching this substring")
     ap.add_argument("--files", default="", help="Filter: comma-separated filename substrings (e.g. 'Michelle_Wilson,Peter_Otteni')")
     ap.add_argument("--attachment", default="", help="Path to PDF file to attach to all outgoing emails")
+    ap.add_argument("--parallel", type=int, default=1, metavar="N",
+                    help="Send over N concurrent SMTP connections (default: 1)")
     args = ap.parse_args()
 
-    drafts = sorted(OUTBOUND_DIR.glob("CW_*.md"))
+    drafts = _list_drafts()
     if not drafts:
         print("No CW_*.md drafts found in Pending_Approval/Outbound/")
         print("Run first: python run_cw_leads_pipeline.py")
@@ -121,8 +190,8 @@ def main() -> int:
 
     # Parse all drafts
     emails = []
-    for fpath in drafts:
-        em = _parse_draft(fpath)
+    for entry, em in zip(drafts, _parse_drafts_cached(drafts)):
+        fpath = Path(entry.path)
         if not em:
             print(f"  Skipping unparseable draft: {fpath.name}")
             continue
@@ -171,8 +240,7 @@ def main() -> int:
         print(f"  COMPANY: {em['company']}")
         print(f"  SUBJECT: {em['subject']}")
         print(f"  BODY:\n")
-        for line in em["body"].split("\n"):
-            print(f"    {line}")
+        print(textwrap.indent(em["body"], "    ", lambda _line: True))  # indent blank lines too
         print()
 
     if args.dry_run:
@@ -213,19 +281,71 @@ def main() -> int:
         print(f"Attachment: {attachment_path}")
 
     print(f"\nSending {len(to_send)} email(s)...")
+    # Imported only on the real-send path (smtplib / email.mime aren't needed for --dry-run)
+    from email_sender import (
+        SMTPSession, build_attachment_part, send_from_admin, send_from_admin_with_prebuilt_attachment,
+    )
+
+    # Read + encode the attachment once for the whole batch
+    pdf_part = build_attachment_part(attachment_path) if attachment_path else None
+
+    # Each worker thread keeps its own logged-in SMTP connection for the whole batch.
+    # Results are recorded in completion order in the main thread (printing + sent_log).
+    _local = threading.local()
+    sessions: list[SMTPSession] = []
+
+    def _send(em: dict) -> tuple[bool, str]:
+        smtp = getattr(_local, "smtp", None)
+        if smtp is None:
+            smtp = _local.smtp = SMTPSession()
+            sessions.append(smtp)
+        if pdf_part is not None:
+            return send_from_admin_with_prebuilt_attachment(
+                em["to_email"], em["subject"], em["body"], pdf_part, session=smtp
+            )
+        return send_from_admin(em["to_email"], em["subject"], em["body"], session=smtp)
+
     sent_count = 0
-    for em in to_send:
-        if attachment_path:
-            ok, msg = send_from_admin_with_attachment(em["to_email"], em["subject"], em["body"], attachment_path)
-        else:
-            ok, msg = send_from_admin(em["to_email"], em["subject"], em["body"])
+    logged: list[dict] = []  # sent but not yet in sent_log.csv; flushed every LOG_FLUSH_EVERY
+    futures: dict = {}       # future -> em, in submit order
+    handled: set = set()     # futures whose result has been printed/logged
+
+    def _record(fut) -> None:
+        nonlocal sent_count
+        handled.add(fut)
+        em = futures[fut]
+        try:
+            ok, msg = fut.result()
+        except Exception as e:
+            ok, msg = False, str(e)
         if ok:
             print(f"  OK: {em['to_email']} ({em['company']})")
-            _log_sent(em)
+            logged.append({**em, "sent_at": datetime.now(timezone.utc).isoformat()})
             sent_count += 1
+            if len(logged) >= LOG_FLUSH_EVERY:
+                _log_sent_batch(logged)
+                logged.clear()
         else:
             print(f"  FAILED: {em['to_email']} — {msg}")
 
+    # Results are recorded as each send completes (print + sent_log stay in the main thread)
+    pool = ThreadPoolExecutor(max_workers=max(1, args.parallel))
+    try:
+        for em in to_send:
+            futures[pool.submit(_send, em)] = em
+        for fut in as_completed(futures):
+            _record(fut)
+    finally:
+        # On Ctrl-C / crash: drop sends that haven't started, wait for in-flight ones,
+        # then record every finished send so nothing that went out is missing from the log.
+        pool.shutdown(wait=True, cancel_futures=True)
+        for fut in futures:
+            if fut not in handled and fut.done() and not fut.cancelled():
+                _record(fut)
+        _log_sent_batch(logged)
+        for smtp in sessions:
+            smtp.close()
+
     print(f"\nDone. Sent {sent_count}/{len(to_send)} emails.")
     if sent_count > 0:
         print(f"Send log: {SENT_LOG}")
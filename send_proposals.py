@@ -13,7 +13,7 @@ try:
 except ImportError:
     pass
 
-from email_sender import send_from_admin_with_attachment
+from email_sender import admin_smtp_session, send_from_admin_with_attachment
 
 PROJECTS_BASE = r"C:\Users\Kyle Cao\DC Business\Building Code Consulting\Projects"
 
@@ -73,7 +73,7 @@ Please feel free to reach out with any questions, or if you'd like to hop on a q
 }
 
 
-def send_one(key: str, dry_run: bool = False) -> bool:
+def send_one(key: str, dry_run: bool = False, session=None) -> bool:
     p = PROPOSALS[key]
     print(f"\n{'[DRY RUN] ' if dry_run else ''}Sending to {p['contact']} <{p['to']}>")
     print(f"  Subject : {p['subject']}")
@@ -89,6 +89,7 @@ def send_one(key: str, dry_run: bool = False) -> bool:
         subject=p["subject"],
         body_plain=p["body"],
         attachment_path=p["pdf"],
+        session=session,
     )
     if ok:
         print(f"  OK: {msg}")
@@ -112,9 +113,10 @@ def main():
     print("=" * 60)
 
     all_ok = True
-    for key in keys:
-        ok = send_one(key, dry_run=args.dry_run)
-        all_ok = all_ok and ok
+    with admin_smtp_session() as smtp:
+        for key in keys:
+            ok = send_one(key, dry_run=args.dry_run, session=smtp)
+            all_ok = all_ok and ok
 
     print("\n" + ("=" * 60))
     if all_ok:
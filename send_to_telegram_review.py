@@ -3,14 +3,26 @@ send_to_telegram_review.py
 把最终版 email 草稿(.md) 和提案 PDF 发到 Telegram，供手机端审阅。
 同时清理 Pending_Approval/Outbound 里的旧版草稿。
 """
+import argparse
+import hashlib
+import json
 import os
 import sys
-import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson  # optional: faster JSON for sendMessage payloads
+except ImportError:
+    orjson = None
 
 ROOT = Path(__file__).resolve().parent
 load_dotenv(ROOT / ".env")
@@ -21,8 +33,22 @@ if not BOT_TOKEN or not CHAT_IDS_RAW:
     print("ERROR: TELEGRAM_BOT_TOKEN or TELEGRAM_ALLOWED_CHAT_IDS missing from .env")
     sys.exit(1)
 CHAT_ID = CHAT_IDS_RAW.split(",")[0].strip()
+API_BASE = f"https://api.telegram.org/bot{BOT_TOKEN}"
+SEND_MSG_URL = f"{API_BASE}/sendMessage"
+SEND_DOC_URL = f"{API_BASE}/sendDocument"
+# 文本里用了 *粗体*，必须带 parse_mode 才会渲染；关闭链接预览省掉服务端抓取
+BASE_MSG_PAYLOAD = {"chat_id": CHAT_ID, "parse_mode": "Markdown", "disable_web_page_preview": True}
+# 上传超时：连接 5 秒；读取默认 500 秒（与 Bot API 服务器自身的空闲超时一致），可用 TG_UPLOAD_TIMEOUT 调整
+UPLOAD_READ_TIMEOUT = int(os.getenv("TG_UPLOAD_TIMEOUT", "500"))
+
+# 共享 keep-alive 连接池，避免每次请求都重新 TLS 握手（pool_maxsize ≥ 线程池大小）
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
 OUTBOUND = ROOT / "Pending_Approval" / "Outbound"
+# 已发送内容的 SHA1 → {message_id, date}；24 小时内内容未变则不重复发送（--force 跳过缓存）
+SENT_CACHE_PATH = OUTBOUND / ".tg_sent_cache.json"
+SENT_CACHE_TTL = 24 * 3600
 PROJECTS = ROOT.parent / "Projects"
 
 # ── Files to DELETE (old drafts) ──────────────────────────────────────────────
@@ -35,32 +61,49 @@ OLD_DRAFTS = [
     "Email_20_F_Street_NW_Suite550_READY.md",
     "Email_St_Josephs_Capitol_Hill_READY.md",
 ]
+# 本脚本自己生成的旧版草稿（Email_<slug>_YYYYMMDD_HHMM.md）按 slug 自动清理，新增客户无需改这里。
+# 不用宽泛的 *_Draft.md：Outbound 是各流程共用目录，其它脚本的待审草稿不能误删。
+STAMP_GLOB = "[0-9]" * 8 + "_" + "[0-9]" * 4
 
 # ── Final email content for both projects ─────────────────────────────────────
-TS = datetime.now().strftime("%Y%m%d_%H%M")
+NOW = datetime.now()
+NOW_FMT = NOW.strftime("%Y-%m-%d %H:%M")
+TS = NOW.strftime("%Y%m%d_%H%M")
 
-EMAILS = [
-    {
-        "slug": "20F_Street_NW_Suite550",
-        "to": "Angel Colon <acolon@hbwconstruction.com>",
-        # Cold outreach: no "Proposal" in subject
-        "subject": "Third-Party Inspection Services for 20 F St NW Suite 550 | Building Code Consulting LLC",
-        "body": """\
-Hi Angel,
+# 两封冷开发邮件正文 ~95% 相同：共用一份模板，只替换差异片段
+BODY_TEMPLATE = """\
+Hi {first_name},
 
-I came across the 20 F Street NW, Suite 550 Tenant Renovation project and wanted to take a moment to introduce Building Code Consulting LLC (BCC) as a potential resource for your Third-Party Inspection needs.
+{opening} Building Code Consulting LLC (BCC) as a potential resource for your Third-Party Inspection needs.
 
-BCC is a DC-based engineering firm focused exclusively on Washington, D.C. Third-Party Code Compliance Inspections. A few reasons HBW Construction may find us a strong fit for this project:
+BCC is a DC-based engineering firm focused exclusively on Washington, D.C. Third-Party Code Compliance Inspections. A few reasons {company} may find us a strong fit for this project:
 
-Multi-Discipline Expertise: Our team holds PE licenses (Civil and Electrical) and ICC Master Code Professional (MCP) certifications. We handle Building, Mechanical, Electrical, Plumbing, and Fire inspections and resolve technical code questions on-site to prevent delays.
+Multi-Discipline {discipline_title}: Our team holds PE licenses (Civil and Electrical) and ICC Master Code Professional (MCP) certifications. We handle Building, Mechanical, Electrical, Plumbing, and Fire inspections {discipline_tail}
 
-Responsive Scheduling: We offer same-day or next-business-day inspection availability to keep your project milestones on track.
+{responsive}
 
-Fair, Visit-Based Billing: We bill strictly based on actual visits completed — never based on an upfront estimate. If your project wraps up in fewer inspections than projected, you pay only for what was done.
+{billing}
 
-We are not submitting a formal proposal at this stage, but if you are still finalizing your inspection vendor list for this project, we would welcome the opportunity to provide a competitive quote.
+We are not submitting a formal proposal at this stage, but if you are still {vendor_clause} provide a competitive quote.
 
-Are you open to a quick 5-minute call or a brief capability overview?""",
+Are you open to a quick 5-minute call or a brief capability overview?"""
+
+EMAILS = [
+    {
+        "slug": "20F_Street_NW_Suite550",
+        "to": "Angel Colon <acolon@hbwconstruction.com>",
+        # Cold outreach: no "Proposal" in subject
+        "subject": "Third-Party Inspection Services for 20 F St NW Suite 550 | Building Code Consulting LLC",
+        "body": BODY_TEMPLATE.format(
+            first_name="Angel",
+            opening="I came across the 20 F Street NW, Suite 550 Tenant Renovation project and wanted to take a moment to introduce",
+            company="HBW Construction",
+            discipline_title="Expertise",
+            discipline_tail="and resolve technical code questions on-site to prevent delays.",
+            responsive="Responsive Scheduling: We offer same-day or next-business-day inspection availability to keep your project milestones on track.",
+            billing="Fair, Visit-Based Billing: We bill strictly based on actual visits completed — never based on an upfront estimate. If your project wraps up in fewer inspections than projected, you pay only for what was done.",
+            vendor_clause="finalizing your inspection vendor list for this project, we would welcome the opportunity to",
+        ),
         # Cold outreach: no PDF attachment
         "pdf": None,
     },
@@ -69,22 +112,16 @@ Are you open to a quick 5-minute call or a brief capability overview?""",
         "to": "Alex Pauley <apauley@kellerbrothers.com>",
         # Cold outreach: no "Proposal" in subject
         "subject": "Third-Party Inspection Services for St. Joseph's on Capitol Hill | Building Code Consulting LLC",
-        "body": """\
-Hi Alex,
-
-I noticed that Keller Brothers is working on the St. Joseph's on Capitol Hill – Phase I project and wanted to briefly introduce Building Code Consulting LLC (BCC) as a potential resource for your Third-Party Inspection needs.
-
-BCC is a DC-based engineering firm focused exclusively on Washington, D.C. Third-Party Code Compliance Inspections. A few reasons Keller Brothers may find us a strong fit for this project:
-
-Multi-Discipline Coverage: Our team holds PE licenses (Civil and Electrical) and ICC Master Code Professional (MCP) certifications. We handle Building, Mechanical, Electrical, Plumbing, and Fire inspections under one roof and resolve technical disputes on-site to prevent unnecessary hold-ups.
-
-Responsive Turnaround: We offer same-day or next-business-day scheduling to help protect your critical milestones — especially important for a project with historic components like this one.
-
-Fair, Visit-Based Billing: We bill based on actual visits completed. You are never charged based on an upfront estimate. If inspections wrap up faster than projected, you pay only for what was done.
-
-We are not submitting a formal proposal at this stage, but if you are still looking at inspection vendor options for this project, we would be happy to provide a competitive quote.
-
-Are you open to a quick 5-minute call or a brief capability overview?""",
+        "body": BODY_TEMPLATE.format(
+            first_name="Alex",
+            opening="I noticed that Keller Brothers is working on the St. Joseph's on Capitol Hill – Phase I project and wanted to briefly introduce",
+            company="Keller Brothers",
+            discipline_title="Coverage",
+            discipline_tail="under one roof and resolve technical disputes on-site to prevent unnecessary hold-ups.",
+            responsive="Responsive Turnaround: We offer same-day or next-business-day scheduling to help protect your critical milestones — especially important for a project with historic components like this one.",
+            billing="Fair, Visit-Based Billing: We bill based on actual visits completed. You are never charged based on an upfront estimate. If inspections wrap up faster than projected, you pay only for what was done.",
+            vendor_clause="looking at inspection vendor options for this project, we would be happy to",
+        ),
         # Cold outreach: no PDF attachment
         "pdf": None,
     },
@@ -95,48 +132,247 @@ Are you open to a quick 5-minute call or a brief capability overview?""",
 
 
 # ── Telegram helpers ──────────────────────────────────────────────────────────
+class RateLimiter:
+    """Telegram 限速：全局 30 条/秒（1 秒滑动窗口）+ 同一聊天 1 条/秒。线程安全。"""
+
+    def __init__(self, global_per_sec=30, per_chat_interval=1.0):
+        self.global_per_sec = global_per_sec
+        self.per_chat_interval = per_chat_interval
+        self._lock = threading.Lock()
+        self._recent = deque()   # 最近 1 秒内的发送时间戳
+        self._last_sent = {}     # chat_id -> 上次发送时间
+
+    def acquire(self, chat_id):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._recent and now - self._recent[0] >= 1.0:
+                    self._recent.popleft()
+                last = self._last_sent.get(chat_id)
+                wait = 0.0 if last is None else self.per_chat_interval - (now - last)
+                if len(self._recent) >= self.global_per_sec:
+                    wait = max(wait, 1.0 - (now - self._recent[0]))
+                if wait <= 0:
+                    self._recent.append(now)
+                    self._last_sent[chat_id] = now
+                    return
+            time.sleep(wait)
+
+
+LIMITER = RateLimiter()
+MAX_TRIES = 3
+
+
+def _post(url, **kwargs):
+    """限速后 POST；遇到 429 按 retry_after 等待后重试（最多 MAX_TRIES 次）。"""
+    for attempt in range(MAX_TRIES):
+        for spec in (kwargs.get("files") or {}).values():
+            spec[1].seek(0)  # 重试时从头重新上传（spec = (文件名, 文件对象[, content-type])）
+        LIMITER.acquire(CHAT_ID)
+        r = SESSION.post(url, **kwargs)
+        if r.status_code != 429 or attempt == MAX_TRIES - 1:
+            return r
+        try:
+            retry_after = int(r.json().get("parameters", {}).get("retry_after", 5))
+        except ValueError:
+            retry_after = 5
+        print(f"  Telegram 429, retry in {retry_after}s")
+        time.sleep(retry_after)
+    return r
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _dumps(payload):
+    """payload → UTF-8 JSON bytes（有 orjson 用 orjson，否则标准库）。"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _chunks(text, n=4000):
+    """逐段产出 ≤n 字符的片段，尽量在换行处切分（留出 4096 UTF-16 上限的余量，避免切断 *粗体* 标记）。"""
+    start = 0
+    while start < len(text):
+        end = min(start + n, len(text))
+        if end < len(text):
+            nl = text.rfind("\n", start, end)
+            if nl > start:
+                yield text[start:nl]
+                start = nl + 1  # 换行符本身不发送
+                continue
+        yield text[start:end]
+        start = end
+
+
 def tg_message(text):
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-    chunks = [text[i:i+4096] for i in range(0, len(text), 4096)]
-    for chunk in chunks:
-        r = requests.post(url, json={"chat_id": CHAT_ID, "text": chunk}, timeout=15)
+    """发送文本（超长自动分段）。成功返回最后一段的 message_id，失败返回 None。"""
+    if not text.strip():
+        print("  WARNING: empty text, skipping")
+        return None
+    if DRY_RUN:
+        print(f"  [DRY] sendMessage len={len(text)}: {text.splitlines()[0][:80]}")
+        return True
+    message_id = None
+    for chunk in _chunks(text):
+        r = _post(SEND_MSG_URL, data=_dumps({**BASE_MSG_PAYLOAD, "text": chunk}),
+                  headers=JSON_HEADERS, timeout=15)
+        if r.status_code == 400 and "parse entities" in r.text:
+            # Markdown 解析失败（正文里有未配对的 * _ 等）：退回纯文本重发
+            payload = {**BASE_MSG_PAYLOAD, "text": chunk}
+            del payload["parse_mode"]
+            r = _post(SEND_MSG_URL, data=_dumps(payload), headers=JSON_HEADERS, timeout=15)
         if not r.ok:
             print(f"  Telegram message error: {r.status_code} {r.text}")
-            return False
-    return True
-
-
-def tg_document(file_path, caption=""):
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendDocument"
-    with open(file_path, "rb") as f:
-        r = requests.post(url, data={"chat_id": CHAT_ID, "caption": caption},
-                          files={"document": (os.path.basename(file_path), f)}, timeout=60)
+            return None
+        message_id = r.json()["result"]["message_id"]
+    return message_id
+
+
+MAX_UPLOAD_BYTES = 49 * 1024 * 1024  # Bot API 上传上限 50MB，留一点余量
+_CONTENT_TYPES = {".pdf": "application/pdf", ".md": "text/markdown"}
+
+
+def tg_document(file_path: Path, caption=""):
+    """上传文件。成功返回 message_id，失败返回 None。"""
+    size = file_path.stat().st_size
+    if size > MAX_UPLOAD_BYTES:
+        print(f"  ERROR: {file_path.name} = {size / 1e6:.1f}MB exceeds Telegram's 50MB bot upload limit")
+        return None
+    if DRY_RUN:
+        print(f"  [DRY] sendDocument {file_path.name} ({size} bytes)")
+        return True
+    ctype = _CONTENT_TYPES.get(file_path.suffix.lower(), "application/octet-stream")
+    with open(file_path, "rb", buffering=65536) as f:
+        r = _post(SEND_DOC_URL, data={"chat_id": CHAT_ID, "caption": caption},
+                  files={"document": (file_path.name, f, ctype)},
+                  timeout=(5, UPLOAD_READ_TIMEOUT))
     if not r.ok:
         print(f"  Telegram document error: {r.status_code} {r.text}")
-        return False
-    return True
+        return None
+    return r.json()["result"]["message_id"]
+
+
+# ── Sent-content cache ────────────────────────────────────────────────────────
+_sent_cache = {}
+_sent_lock = threading.Lock()
+FORCE = False
+DRY_RUN = False  # --dry-run：只打印将要发送的内容，不发任何网络请求
+
+
+def _load_sent_cache():
+    """读取缓存并丢弃超过 SENT_CACHE_TTL 的条目。"""
+    try:
+        data = json.loads(SENT_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    cutoff = time.time() - SENT_CACHE_TTL
+    return {k: v for k, v in data.items() if v.get("date", 0) >= cutoff}
+
+
+def _save_sent_cache():
+    tmp = SENT_CACHE_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(_sent_cache, indent=2), encoding="utf-8")
+    os.replace(tmp, SENT_CACHE_PATH)
+
+
+def _file_sha1(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _send_once(digest, label, send):
+    """内容（digest）24 小时内已发过则跳过；否则调用 send() 并记录返回的 message_id。"""
+    if not FORCE:
+        with _sent_lock:
+            if digest in _sent_cache:
+                print(f"  cached, skipping: {label}")
+                return
+    message_id = send()
+    if message_id:
+        with _sent_lock:
+            _sent_cache[digest] = {"message_id": message_id, "date": time.time()}
+
+
+def send_one(fpath, em):
+    """发送一封邮件的审阅内容（正文、.md 草稿、PDF）。在线程池中运行，异常打印后吞掉。"""
+    try:
+        # Send email body as text
+        tg_text = (
+            f"📧 *Email Draft — {em['_title']}*\n\n"
+            f"*TO:* {em['to']}\n"
+            f"*Subject:* {em['subject']}\n\n"
+            f"---\n\n{em['body']}"
+        )
+        # .md 与正文只差文件名/生成时间戳，二者都以邮件内容的哈希作为缓存键
+        digest = hashlib.sha1(tg_text.encode("utf-8")).hexdigest()
+        _send_once("msg:" + digest, f"{em['_title']} (text)", lambda: tg_message(tg_text))
+
+        # Send .md file
+        def send_md():
+            message_id = tg_document(fpath, caption=f"Email draft (.md): {fpath.name}")
+            print(f"  Sent email draft: {fpath.name}")
+            return message_id
+        _send_once("md:" + digest, fpath.name, send_md)
+
+        # Send PDF
+        pdf = em["pdf"]
+        pdf_path = Path(pdf) if pdf else None
+        if pdf_path and pdf_path.is_file():
+            def send_pdf():
+                message_id = tg_document(pdf_path, caption=f"Proposal PDF: {pdf_path.name}")
+                print(f"  Sent PDF: {pdf_path.name}")
+                return message_id
+            _send_once("pdf:" + _file_sha1(pdf_path), pdf_path.name, send_pdf)
+        else:
+            print(f"  WARNING: PDF not found — {pdf}")
+    except Exception as e:
+        print(f"  ERROR sending {em['slug']}: {e}")
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 def main():
-    # 1. Clean up old drafts
+    global FORCE, DRY_RUN
+    parser = argparse.ArgumentParser(description="Send final email drafts + PDFs to Telegram for review")
+    parser.add_argument("--force", action="store_true", help="Re-send even if identical content was sent in the last 24h")
+    parser.add_argument("--dry-run", action="store_true", help="Print the would-be Telegram payloads instead of sending")
+    parser.add_argument("--skip-delete", action="store_true", help="Leave old drafts in place")
+    args = parser.parse_args()
+    FORCE, DRY_RUN = args.force, args.dry_run
+
+    OUTBOUND.mkdir(parents=True, exist_ok=True)
+
+    # 1. Clean up old drafts（直接 unlink，一次系统调用；不存在时由异常区分）
     print("── Step 1: Cleaning up old drafts ──")
-    for name in OLD_DRAFTS:
-        p = OUTBOUND / name
-        if p.exists():
-            p.unlink()
+    stale = [] if args.skip_delete else OLD_DRAFTS + [
+        p.name
+        for em in EMAILS
+        for p in OUTBOUND.glob(f"Email_{em['slug']}_{STAMP_GLOB}.md")
+        if not p.name.endswith(f"_{TS}.md")
+    ]
+    for name in stale:
+        try:
+            (OUTBOUND / name).unlink()
             print(f"  Deleted: {name}")
-        else:
+        except FileNotFoundError:
             print(f"  (not found, skip): {name}")
+        except OSError as e:
+            print(f"  ERROR deleting {name}: {e}")
 
     # 2. Write timestamped READY files
     print("\n── Step 2: Writing timestamped email drafts ──")
     ready_files = []
+    pending = []
     for em in EMAILS:
+        em["_title"] = em["slug"].replace("_", " ")
         fname = f"Email_{em['slug']}_{TS}.md"
         fpath = OUTBOUND / fname
-        content = f"""# Email Draft — {em['slug'].replace('_', ' ')}
-# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}  ← LATEST VERSION
+        content = f"""# Email Draft — {em['_title']}
+# Generated: {NOW_FMT}  ← LATEST VERSION
 
 **TO:** {em['to']}
 **CC:** ycao@buildingcodeconsulting.com (auto)
@@ -147,40 +383,38 @@ def main():
 
 {em['body']}
 """
-        fpath.write_text(content, encoding="utf-8")
-        print(f"  Saved: {fname}")
+        # 先统一编码成 bytes，再以二进制写入（跳过 TextIOWrapper 层）
+        pending.append((fpath, content.encode("utf-8")))
         ready_files.append((fpath, em))
 
+    def write_pending():
+        for fp, data in pending:
+            with open(fp, "wb") as f:
+                f.write(data)
+            print(f"  Saved: {fp.name}")
+
     # 3. Send to Telegram
     print("\n── Step 3: Sending to Telegram ──")
     header = (
         f"📋 *BCC Proposal Emails — Final Review*\n"
-        f"🕐 {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
+        f"🕐 {NOW_FMT}\n\n"
         f"两封提案邮件草稿 + PDF 如下，确认后回复 *Y* 让 Claude 发送。"
     )
-    tg_message(header)
-
-    for fpath, em in ready_files:
-        # Send email body as text
-        tg_text = (
-            f"📧 *Email Draft — {em['slug'].replace('_', ' ')}*\n\n"
-            f"*TO:* {em['to']}\n"
-            f"*Subject:* {em['subject']}\n\n"
-            f"---\n\n{em['body']}"
-        )
-        tg_message(tg_text)
-
-        # Send .md file
-        tg_document(fpath, caption=f"Email draft (.md): {fpath.name}")
-        print(f"  Sent email draft: {fpath.name}")
-
-        # Send PDF
-        pdf = em["pdf"]
-        if pdf and Path(pdf).is_file():
-            tg_document(pdf, caption=f"Proposal PDF: {Path(pdf).name}")
-            print(f"  Sent PDF: {Path(pdf).name}")
-        else:
-            print(f"  WARNING: PDF not found — {pdf}")
+    # header 不依赖草稿文件：磁盘写入与第一次网络请求重叠
+    with ThreadPoolExecutor(max_workers=1) as io_ex:
+        writing = io_ex.submit(write_pending)
+        tg_message(header)
+        writing.result()
+
+    # 每封邮件的 正文 → .md → PDF 在同一线程内按顺序发送；不同邮件之间并行
+    _sent_cache.update(_load_sent_cache())
+    try:
+        if ready_files:
+            with ThreadPoolExecutor(max_workers=len(ready_files)) as ex:
+                list(ex.map(lambda t: send_one(*t), ready_files))
+    finally:
+        if not DRY_RUN:
+            _save_sent_cache()
 
     tg_message("✅ 全部发送完毕。请审阅后回复 *Y* 确认发送，或告知修改意见。")
     print("\nDone.")
@@ -5,50 +5,180 @@ Requires in .env: TELEGRAM_BOT_TOKEN, TELEGRAM_ALLOWED_CHAT_IDS; free-text chat
 """
 import asyncio
 import os
+import re
 import sys
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+from itertools import islice
 from pathlib import Path
 
-try:
-    from dotenv import load_dotenv
-    _dir = os.path.dirname(os.path.abspath(__file__))
-    load_dotenv(os.path.join(_dir, ".env"))
-except ImportError:
-    pass
+_ENV_KEYS = {"PENDING_APPROVAL_DIR", "GEMINI_API_KEY", "GEMINI_MODEL_PREFERENCE",
+             "TELEGRAM_BOT_TOKEN", "TELEGRAM_ALLOWED_CHAT_IDS"}
+
+
+# 单行 KEY=value 的写法与 python-dotenv 一致：可选 export 前缀；单/双引号值取引号内内容（支持转义，
+# 引号后可跟注释）；无引号值去掉 “空白+#” 开始的行内注释
+_ENV_LINE_RE = re.compile(r"^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_.]*)\s*=\s*(.*)$")
+_ENV_SQUOTED_RE = re.compile(r"'((?:\\'|[^'])*)'")
+_ENV_DQUOTED_RE = re.compile(r'"((?:\\"|[^"])*)"')
+_ENV_SQ_ESCAPES = re.compile(r"\\[\\']")
+_ENV_DQ_ESCAPES = re.compile(r"\\[\\'\"abfnrtv]")
+
+
+def _env_value(raw: str):
+    """解析 = 右边的值；引号后跟了注释以外的内容（dotenv 视为语法错误）时返回 None。"""
+    for quoted, escapes, unescape in (
+        (_ENV_SQUOTED_RE, _ENV_SQ_ESCAPES, lambda e: e.group(0)[1]),
+        (_ENV_DQUOTED_RE, _ENV_DQ_ESCAPES, lambda e: e.group(0).encode().decode("unicode-escape")),
+    ):
+        m = quoted.match(raw)
+        if m:
+            rest = raw[m.end():].strip()
+            return escapes.sub(unescape, m.group(1)) if not rest or rest.startswith("#") else None
+    return re.sub(r"\s+#.*", "", raw).rstrip()
+
+
+def _load_env_subset(path, keys):
+    """只从 .env 读取本模块用到的几个键（不覆盖已有环境变量），省掉 import 时的 python-dotenv。
+    email_sender / approval_monitor 等被调用的模块各自加载自己的 .env。"""
+    try:
+        fh = open(path, "r", encoding="utf-8")
+    except OSError:
+        return
+    with fh:
+        for line in fh:
+            m = _ENV_LINE_RE.match(line.rstrip("\r\n"))
+            if m and m.group(1) in keys and m.group(1) not in os.environ:
+                value = _env_value(m.group(2).strip())
+                if value is not None:
+                    os.environ[m.group(1)] = value
+
+
+_load_env_subset(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"), _ENV_KEYS)
+
+
+def _env_clean(name: str) -> str:
+    """环境变量值，去掉首尾空白和引号（统一处理 .env 里常见的 KEY="value" 写法）。"""
+    return os.environ.get(name, "").strip().strip('"')
+
 
 BASE_DIR = Path(__file__).resolve().parent
-_env_pending = os.environ.get("PENDING_APPROVAL_DIR", "").strip().strip('"')
+_env_pending = _env_clean("PENDING_APPROVAL_DIR")
 PENDING_DIR = Path(_env_pending) if _env_pending else BASE_DIR / "Pending_Approval"
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "").strip().strip('"')
+GEMINI_API_KEY = _env_clean("GEMINI_API_KEY")
 MAX_TELEGRAM_MESSAGE = 4000
 
 
+def _scandir_md(path, dir_mtimes=None):
+    """递归产出 path 下待审批的 .md（DirEntry，不含 -OK / README）。
+    顺序与 rglob 一致：先本目录文件，再依次深入子目录；跳过符号链接。
+    传入 dir_mtimes 时顺带记录每个目录（扫描前）的 mtime_ns。"""
+    if dir_mtimes is not None:
+        dir_mtimes[path] = _mtime_ns(path)
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_symlink():
+                continue
+            if entry.is_dir():
+                subdirs.append(entry.path)
+            elif entry.name.endswith(".md") and "-OK" not in entry.name and "README" not in entry.name:
+                yield entry
+    for sub in subdirs:
+        yield from _scandir_md(sub, dir_mtimes)
+
+
+# 短 TTL 缓存：连续的 /pending、/summary、自由对话共用一次目录扫描。
+# 草稿列表另外记录树中每个目录的 mtime：TTL 过后只需每个目录 stat 一次，
+# 全部未变（无增删改名）就直接复用，不再逐文件遍历。
+CACHE_TTL = 2.0
+# 对话上下文缓存更久：连续几轮对话发给 Gemini 的上下文逐字节相同，便于命中其隐式前缀缓存
+CONTEXT_CACHE_TTL = 10.0
+_DRAFTS_CACHE = {"dirs": {}, "ts": 0.0, "value": [], "by_stem": {}}
+_CONTEXT_CACHE = {"mtime": None, "ts": 0.0, "value": ""}
+_SENT_TODAY_CACHE = {"key": None, "ts": 0.0, "value": 0}
+
+
+def _mtime_ns(path) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def _invalidate_caches():
+    _DRAFTS_CACHE["dirs"] = {}
+    _CONTEXT_CACHE["mtime"] = None
+    _SENT_TODAY_CACHE["key"] = None
+
+
 def get_pending_drafts():
     """返回待审批草稿列表（不含 -OK）。"""
-    if not PENDING_DIR.exists():
+    if _mtime_ns(PENDING_DIR) < 0:
         return []
-    out = []
-    for f in PENDING_DIR.rglob("*.md"):
-        if f.is_file() and "-OK" not in f.name and "README" not in f.name:
-            rel = f.relative_to(PENDING_DIR)
-            out.append((str(rel), f))
-    return out
+    now = time.monotonic()
+    dirs = _DRAFTS_CACHE["dirs"]
+    if dirs and (now - _DRAFTS_CACHE["ts"] < CACHE_TTL
+                 or all(_mtime_ns(d) == m for d, m in dirs.items())):
+        return _DRAFTS_CACHE["value"]
+    dirs = {}
+    base_len = len(str(PENDING_DIR)) + 1  # DirEntry.path 都以 PENDING_DIR + 分隔符开头，直接切片代替 relpath
+    value = [(e.path[base_len:], Path(e.path)) for e in _scandir_md(str(PENDING_DIR), dirs)]
+    by_stem = {}
+    for _, f in value:
+        by_stem.setdefault(f.stem.lower(), f)
+    _DRAFTS_CACHE.update(dirs=dirs, ts=now, value=value, by_stem=by_stem)
+    return value
+
+
+def _find_draft(base_name: str):
+    """按名称查找草稿：先查小写文件名索引（精确匹配），再在缓存列表里做一次子串匹配。不遍历目录。"""
+    drafts = get_pending_drafts()
+    key = base_name.lower()
+    f = _DRAFTS_CACHE["by_stem"].get(key)
+    if f is not None:
+        return f
+    for _, f in drafts:
+        stem = f.stem.lower()
+        if key in stem or stem in key:
+            return f
+    return None
+
+
+def _count_sent_today() -> int:
+    """Sent/ 下今天修改过的 .md 数量：预先算好今天的 [start, end) 时间戳，逐个比较 st_mtime。
+    与草稿列表同样按 (Sent/ mtime, 日期) + CACHE_TTL 缓存，/summary 与对话上下文共用一次扫描。"""
+    sent_dir = BASE_DIR / "Sent"
+    mtime = _mtime_ns(sent_dir)
+    if mtime < 0:
+        return 0
+    key = (mtime, datetime.now().date())
+    now = time.monotonic()
+    if now - _SENT_TODAY_CACHE["ts"] < CACHE_TTL and key == _SENT_TODAY_CACHE["key"]:
+        return _SENT_TODAY_CACHE["value"]
+    value = _scan_sent_today(sent_dir)
+    _SENT_TODAY_CACHE.update(key=key, ts=now, value=value)
+    return value
+
+
+def _scan_sent_today(sent_dir) -> int:
+    midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = midnight.timestamp()
+    end = (midnight + timedelta(days=1)).timestamp()  # 不用 +86400，夏令时切换日也准确
+    count = 0
+    with os.scandir(sent_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".md") and entry.is_file() and start <= entry.stat().st_mtime < end:
+                count += 1
+    return count
 
 
 def get_summary_text():
     """今日进度摘要文本。"""
     from datetime import datetime
     drafts = get_pending_drafts()
-    sent_dir = BASE_DIR / "Sent"
-    sent_today = 0
-    if sent_dir.exists():
-        today = datetime.now().strftime("%Y-%m-%d")
-        for f in sent_dir.glob("*.md"):
-            try:
-                if datetime.fromtimestamp(f.stat().st_mtime).strftime("%Y-%m-%d") == today:
-                    sent_today += 1
-            except Exception:
-                pass
+    sent_today = _count_sent_today()
     lines = [
         f"📊 BCC 今日简报 {datetime.now().strftime('%Y-%m-%d %H:%M')}",
         f"待审批草稿: {len(drafts)}",
@@ -56,7 +186,7 @@ def get_summary_text():
         "",
         "待审批列表:",
     ]
-    for name, _ in drafts[:15]:
+    for name, _ in islice(drafts, 15):
         lines.append(f"  • {name}")
     if len(drafts) > 15:
         lines.append(f"  … 共 {len(drafts)} 个")
@@ -65,57 +195,175 @@ def get_summary_text():
 
 def get_agent_context() -> str:
     """供 AI 参考的当前业务上下文（待审批、已发、Research 等）。"""
+    # BASE_DIR 的 mtime 覆盖 Research_*.md 的增删；日期变了 sent_today 要重算
+    key = (_mtime_ns(PENDING_DIR), _mtime_ns(BASE_DIR / "Sent"), _mtime_ns(BASE_DIR),
+           datetime.now().strftime("%Y-%m-%d"))
+    now = time.monotonic()
+    if now - _CONTEXT_CACHE["ts"] < CONTEXT_CACHE_TTL and key == _CONTEXT_CACHE["mtime"]:
+        return _CONTEXT_CACHE["value"]
+    value = _build_agent_context()
+    _CONTEXT_CACHE.update(mtime=key, ts=now, value=value)
+    return value
+
+
+def _research_names(limit: int) -> list:
+    """BASE_DIR 下前 limit 个 Research_*.md 的公司名；凑够就停，不必列完整个目录。"""
+    with os.scandir(BASE_DIR) as it:
+        names = (e.name for e in it if e.name.startswith("Research_") and e.name.endswith(".md"))
+        return [n[len("Research_"):-3] for n in islice(names, limit)]
+
+
+def _build_agent_context() -> str:
     from datetime import datetime
     drafts = get_pending_drafts()
-    sent_dir = BASE_DIR / "Sent"
-    sent_today = 0
-    if sent_dir.exists():
-        today = datetime.now().strftime("%Y-%m-%d")
-        for f in sent_dir.glob("*.md"):
-            try:
-                if datetime.fromtimestamp(f.stat().st_mtime).strftime("%Y-%m-%d") == today:
-                    sent_today += 1
-            except Exception:
-                pass
-    research = list(BASE_DIR.glob("Research_*.md"))
-    research_names = [f.stem.replace("Research_", "") for f in research[:20]]
+    sent_today = _count_sent_today()
+    research_names = _research_names(20)
     return (
         f"Today: {datetime.now().strftime('%Y-%m-%d %H:%M')}. "
         f"Pending approval drafts: {len(drafts)}. Sent today: {sent_today}. "
-        f"Draft names: {[n for n, _ in drafts[:15]]}. "
+        f"Draft names: {[n for n, _ in islice(drafts, 15)]}. "
         f"Research files (companies): {research_names}."
     )
 
 
-def call_gemini_agent(user_message: str, context: str) -> str:
-    """同步调用 Gemini API（新 SDK google-genai），返回模型回复（用于 BCC 销售助理）。"""
-    if not GEMINI_API_KEY:
-        return ""
-    try:
+# 模型优先顺序；可用 GEMINI_MODEL_PREFERENCE（逗号分隔）在 .env 里固定，不用改代码
+GEMINI_MODELS = tuple(
+    m.strip() for m in _env_clean("GEMINI_MODEL_PREFERENCE").split(",") if m.strip()
+) or ("gemini-2.5-flash", "gemini-2.0-flash", "gemini-2.0-flash-001")
+_GEMINI_CLIENT = None  # 进程内复用一个 Client（连接池 / 认证只建立一次）
+_GEMINI_MODEL = None   # 第一个可用的模型 ID；之后直接用它，不再逐个 404 探测
+_GEMINI_DEAD_MODELS = set()  # 本进程内已 404 的模型，之后不再尝试
+
+
+def _gemini_client():
+    global _GEMINI_CLIENT
+    if _GEMINI_CLIENT is None:
         from google import genai
-        client = genai.Client(api_key=GEMINI_API_KEY)
-        prompt = f"""You are the AI assistant for Building Code Consulting (BCC). Yue Cao (PE, MCP) uses you via Telegram for lead gen and CRM.
+        _GEMINI_CLIENT = genai.Client(api_key=GEMINI_API_KEY)
+    return _GEMINI_CLIENT
+
+
+def _gemini_model_order():
+    models = tuple(m for m in GEMINI_MODELS if m not in _GEMINI_DEAD_MODELS)
+    if not models:
+        # 全部 404 过：清空记录重新探测一轮，而不是永久失效
+        _GEMINI_DEAD_MODELS.clear()
+        models = GEMINI_MODELS
+    if _GEMINI_MODEL in models:
+        return (_GEMINI_MODEL,) + tuple(m for m in models if m != _GEMINI_MODEL)
+    return models
+
+
+def _mark_model_dead(model_id: str) -> None:
+    global _GEMINI_MODEL
+    _GEMINI_DEAD_MODELS.add(model_id)
+    if model_id == _GEMINI_MODEL:
+        _GEMINI_MODEL = None  # 缓存的模型下线了，重新探测
+
+
+# 不变的说明放最前面，其次是（有缓存的）上下文，最后才是每轮变化的用户消息：
+# 公共前缀越长，Gemini 隐式缓存命中越多
+_PROMPT_PREFIX = ("You are the AI assistant for Building Code Consulting (BCC). "
+                  "Yue Cao (PE, MCP) uses you via Telegram for lead gen and CRM.\n\n"
+                  "Reply in a helpful, concise way. You can answer questions about pending drafts, sent emails, "
+                  "research, or suggest next steps (e.g. run batch research, approve a draft). "
+                  "Keep the reply under 500 words and in the same language as the user when possible.\n\n"
+                  "Current context: ")
+
 
-Current context: {context}
+def _agent_prompt(user_message: str, context: str) -> str:
+    return f"{_PROMPT_PREFIX}{context}\n\nThe user just said (via Telegram): {user_message}"
 
-The user just said (via Telegram): {user_message}
 
-Reply in a helpful, concise way. You can answer questions about pending drafts, sent emails, research, or suggest next steps (e.g. run batch research, approve a draft). Keep the reply under 500 words and in the same language as the user when possible."""
-        for model_id in ("gemini-2.5-flash", "gemini-2.0-flash", "gemini-2.0-flash-001"):
+def _is_model_not_found(e: Exception) -> bool:
+    err = str(e).lower()
+    return "404" in err or "not found" in err
+
+
+_NO_MODEL_MSG = "Agent 调用出错: 当前 API 下无可用模型，请检查 Google AI Studio 可用模型列表。"
+
+
+def call_gemini_agent(user_message: str, context: str) -> str:
+    """同步调用 Gemini API（新 SDK google-genai），返回模型回复（用于 BCC 销售助理）。CLI 用；bot 内走异步版本。"""
+    global _GEMINI_MODEL
+    if not GEMINI_API_KEY:
+        return ""
+    try:
+        client = _gemini_client()
+        prompt = _agent_prompt(user_message, context)
+        for model_id in _gemini_model_order():
             try:
                 response = client.models.generate_content(model=model_id, contents=prompt)
                 if response and getattr(response, "text", None):
+                    _GEMINI_MODEL = model_id
                     return response.text.strip()
             except Exception as e:
-                err = str(e).lower()
-                if "404" in err or "not found" in err:
+                if _is_model_not_found(e):
+                    _mark_model_dead(model_id)
                     continue
                 return f"Agent 调用出错: {e}"
     except Exception as e:
         return f"Agent 调用出错: {e}"
-    return "Agent 调用出错: 当前 API 下无可用模型，请检查 Google AI Studio 可用模型列表。"
+    return _NO_MODEL_MSG
+
+
+async def stream_gemini_agent(user_message: str, context: str):
+    """流式产出 Gemini 回复片段（client.aio，不占线程池）。
+    模型 404 或没有任何输出时换下一个模型；一旦开始输出，之后的异常直接抛给调用方。
+    所有模型都不可用时什么也不产出。"""
+    global _GEMINI_MODEL
+    client = _gemini_client()
+    prompt = _agent_prompt(user_message, context)
+    for model_id in _gemini_model_order():
+        got = False
+        try:
+            async for chunk in await client.aio.models.generate_content_stream(model=model_id, contents=prompt):
+                text = getattr(chunk, "text", None)
+                if text:
+                    if not got:
+                        got = True
+                        _GEMINI_MODEL = model_id
+                    yield text
+        except Exception as e:
+            if not got and _is_model_not_found(e):
+                _mark_model_dead(model_id)
+                continue
+            raise
+        if got:
+            return
+
+
+async def call_gemini_agent_async(user_message: str, context: str) -> str:
+    """call_gemini_agent 的异步版本：收齐 stream_gemini_agent 的输出后一次返回。"""
+    if not GEMINI_API_KEY:
+        return ""
+    parts = []
+    try:
+        async for piece in stream_gemini_agent(user_message, context):
+            parts.append(piece)
+    except Exception as e:
+        return f"Agent 调用出错: {e}"
+    return "".join(parts).strip() or _NO_MODEL_MSG
+
+
+def _clip_reply(text: str) -> str:
+    if len(text) > MAX_TELEGRAM_MESSAGE:
+        return text[: MAX_TELEGRAM_MESSAGE - 20] + "\n…(truncated)"
+    return text
+
 
 
+_PHASES = (
+    ("scrape leads", "phase1_done"),
+    ("research companies", "phase2_done"),
+    ("compile report", "phase3_done"),
+    ("send report to Telegram", "phase4_done"),
+    ("generate emails", "phase5_done"),
+    ("save drafts", "phase6_done"),
+    ("send drafts to Telegram", "phase7_done"),
+)
+_TRUTHY = frozenset(("1", "true", "yes"))
+
 
 def get_pipeline_status() -> str:
     """Read pipeline_checkpoint.json and return a status summary."""
@@ -134,17 +382,13 @@ def get_pipeline_status() -> str:
     except Exception as e:
         return f"Error reading checkpoint: {e}"
 
-    phase_names = ["scrape leads", "research companies", "compile report",
-                   "send report to Telegram", "generate emails", "save drafts", "send drafts to Telegram"]
-    phase_keys  = ["phase1_done", "phase2_done", "phase3_done",
-                   "phase4_done", "phase5_done", "phase6_done", "phase7_done"]
     lines = [f"🔄 Pipeline Checkpoint ({cp.get('last_updated', '?')[:16]}):"]
-    for i, (name, key) in enumerate(zip(phase_names, phase_keys), 1):
+    for i, (name, key) in enumerate(_PHASES, 1):
         icon = "✅" if cp.get(key) else "⏳"
         lines.append(f"  {icon} Phase {i}: {name}")
     if cp.get("phase2_researched"):
         lines.append(f"  (Phase 2 partial: {len(cp['phase2_researched'])} companies done)")
-    next_phase = next((i + 1 for i, k in enumerate(phase_keys) if not cp.get(k)), 8)
+    next_phase = next((i + 1 for i, (_, k) in enumerate(_PHASES) if not cp.get(k)), 8)
     if next_phase <= 7:
         lines.append(f"\nResume with: python run_cw_leads_pipeline.py --resume")
     else:
@@ -152,60 +396,136 @@ def get_pipeline_status() -> str:
     return "\n".join(lines)
 
 
+def _sent_at_ts(ts_str: str):
+    """sent_at → UTC epoch 秒；无法解析返回 None。
+    我们自己写入的是定宽的 datetime.now(timezone.utc).isoformat()（…+00:00），
+    直接按位置切片构造 datetime；其它格式才退回 fromisoformat。"""
+    from datetime import timezone as _tz
+    s = ts_str.strip()
+    if len(s) >= 25 and s.endswith("+00:00") and s[4] == "-" and s[10] == "T":
+        try:
+            return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                            int(s[11:13]), int(s[14:16]), int(s[17:19]), tzinfo=_tz.utc).timestamp()
+        except ValueError:
+            pass
+    try:
+        ts = datetime.fromisoformat(s.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=_tz.utc)
+    return ts.timestamp()
+
+
 def get_followup_due(days: int = 4) -> list[dict]:
     """Return contacts due for follow-up."""
     import csv as _csv
-    from datetime import datetime as _dt, timedelta as _td, timezone as _tz
     log_path = BASE_DIR / "sent_log.csv"
     if not log_path.exists():
         return []
-    cutoff = _dt.now(_tz.utc) - _td(days=days)
+    cutoff_ts = time.time() - days * 86400
     due = []
     with open(log_path, newline="", encoding="utf-8") as f:
         for row in _csv.DictReader(f):
-            if row.get("replied", "").strip() in ("1", "true", "yes"):
+            if row.get("replied", "").strip() in _TRUTHY:
                 continue
             if row.get("followup_sent_at", "").strip():
                 continue
-            ts_str = row.get("sent_at", "")
-            try:
-                ts = _dt.fromisoformat(ts_str.replace("Z", "+00:00"))
-                if ts.tzinfo is None:
-                    ts = ts.replace(tzinfo=_tz.utc)
-            except Exception:
-                continue
-            if ts <= cutoff:
+            ts = _sent_at_ts(row.get("sent_at") or "")
+            if ts is not None and ts <= cutoff_ts:
                 due.append(row)
     return due
 
 
+def _followup_key(email: str, sent_at: str) -> tuple[str, str]:
+    return email.strip().lower(), sent_at.strip()
+
+
+def write_followup_stamps(stamps: dict) -> None:
+    """把 followup_sent_at 写回 sent_log.csv。stamps: {(email.lower(), sent_at): iso 时间}。
+    逐行流式改写到临时文件再 os.replace，内存只占 O(本批数量)，不整表读入。"""
+    import csv as _csv
+    import tempfile as _tempfile
+    import shutil as _shutil
+    log_path = BASE_DIR / "sent_log.csv"
+    tmp = _tempfile.NamedTemporaryFile(
+        "w", dir=BASE_DIR, delete=False, newline="", encoding="utf-8", suffix=".tmp"
+    )
+    try:
+        with open(log_path, newline="", encoding="utf-8") as src, tmp:
+            reader = _csv.reader(src)
+            writer = _csv.writer(tmp, lineterminator="\r\n")
+            header = next(reader, [])
+            orig_n = len(header)
+            # Ensure new columns present
+            for col in ("replied", "followup_sent_at"):
+                if col not in header:
+                    header.append(col)
+            n = len(header)
+            email_idx, sent_idx = header.index("contact_email"), header.index("sent_at")
+            stamp_idx = header.index("followup_sent_at")
+            writer.writerow(header)
+            for row in reader:
+                if not row:
+                    continue  # 与 DictReader 一致：跳过空行
+                if len(row) != n:
+                    row = row[:orig_n]
+                    row += [""] * (n - len(row))
+                stamp = stamps.get(_followup_key(row[email_idx], row[sent_idx]))
+                if stamp and not row[stamp_idx].strip():
+                    row[stamp_idx] = stamp
+                writer.writerow(row)
+        _shutil.copymode(log_path, tmp.name)  # NamedTemporaryFile 默认 0600
+        os.replace(tmp.name, log_path)
+    except BaseException:
+        # 只有 os.replace 成功才保留临时文件；中途出错（坏行、磁盘满、权限）不留垃圾
+        tmp.close()
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+        raise
+
+
 def mark_contact_replied(email: str) -> tuple[int, str]:
     """Mark a contact as replied in sent_log.csv. Returns (count, message)."""
     import csv as _csv
+    import io as _io
     log_path = BASE_DIR / "sent_log.csv"
     if not log_path.exists():
         return 0, "sent_log.csv not found."
-    rows = []
-    fieldnames = None
-    count = 0
+    needle = email.strip().lower()
     with open(log_path, newline="", encoding="utf-8") as f:
-        reader = _csv.DictReader(f)
-        fieldnames = reader.fieldnames or []
-        for row in reader:
-            if row.get("contact_email", "").strip().lower() == email.strip().lower():
-                row["replied"] = "1"
-                count += 1
-            rows.append(row)
-    if count == 0:
+        content = f.read()
+    # 快速路径：邮箱根本不在文件里就不必解析/重写
+    if needle not in content.lower():
+        return 0, f"No contact found with email: {email}"
+    reader = _csv.reader(_io.StringIO(content))
+    header = next(reader, [])
+    rows = [row for row in reader if row]  # 与 DictReader 一致：跳过空行
+    if "contact_email" not in header:
         return 0, f"No contact found with email: {email}"
     # Ensure new columns present
+    orig_n = len(header)
     for col in ("replied", "followup_sent_at"):
-        if col not in fieldnames:
-            fieldnames = list(fieldnames) + [col]
+        if col not in header:
+            header.append(col)
+    n = len(header)
+    email_idx = header.index("contact_email")
+    replied_idx = header.index("replied")
+    count = 0
+    for i, row in enumerate(rows):
+        if len(row) != n:
+            # 与 DictWriter(extrasaction="ignore") 一致：丢弃超出原表头的字段，缺的补空
+            row = row[:orig_n]
+            rows[i] = row = row + [""] * (n - len(row))
+        if row[email_idx].strip().lower() == needle:
+            row[replied_idx] = "1"
+            count += 1
+    if count == 0:
+        return 0, f"No contact found with email: {email}"
     with open(log_path, "w", newline="", encoding="utf-8") as f:
-        w = _csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        w.writeheader()
-        w.writerows(rows)
+        _csv.writer(f, lineterminator="\r\n").writerows([header] + rows)
     return count, f"✅ Marked {count} row(s) as replied for {email}"
 
 
@@ -302,6 +622,9 @@ def update_phone_status(email: str, status: str, days: int = 2, notes: str = "")
         return f"✅ Marked CONNECTED for {email}."
 
 
+_BASE_NAME_SUFFIX = re.compile(r"(?:-OK|\.md)+$", re.IGNORECASE)  # "foo-OK.md" / "foo.md" / "foo-OK" → "foo"
+
+
 def approve_and_send(base_name: str) -> str:
     """
     将指定草稿“审批”：在 Outbound/Replies 下查找匹配的 .md，复制为 -OK.md 后调用 approval_monitor 处理。
@@ -310,22 +633,140 @@ def approve_and_send(base_name: str) -> str:
     from approval_monitor import process_approved_file
     if not PENDING_DIR.exists():
         return "无 Pending_Approval 目录。"
-    base_name = base_name.strip().replace("-OK", "").replace(".md", "")
-    for f in PENDING_DIR.rglob("*.md"):
-        if not f.is_file() or "-OK" in f.name or "README" in f.name:
-            continue
-        if base_name.lower() in f.stem.lower() or f.stem.lower() in base_name.lower():
-            ok_path = f.parent / f"{f.stem}-OK.md"
-            if ok_path.exists():
-                ok_path.unlink()
-            import shutil
-            shutil.copy2(f, ok_path)
-            if process_approved_file(ok_path):
-                return f"✅ 已发送: {f.name}"
-            if ok_path.exists():
-                ok_path.unlink()
-            return "❌ 发送失败，请检查草稿中**邮箱**、主题、正文是否已填写。"
-    return f"未找到匹配草稿: {base_name}"
+    base_name = _BASE_NAME_SUFFIX.sub("", base_name.strip())
+    f = _find_draft(base_name)
+    if f is not None and not f.is_file():
+        _invalidate_caches()  # 缓存里的草稿已被移走：重新扫描一次
+        f = _find_draft(base_name)
+    if f is None:
+        return f"未找到匹配草稿: {base_name}"
+    ok_path = f.parent / f"{f.stem}-OK.md"
+    if ok_path.exists():
+        ok_path.unlink()
+    import shutil
+    shutil.copy2(f, ok_path)
+    sent = process_approved_file(ok_path)
+    _invalidate_caches()  # 审批结果立即反映到 /pending、/summary
+    if sent:
+        return f"✅ 已发送: {f.name}"
+    if ok_path.exists():
+        ok_path.unlink()
+    return "❌ 发送失败，请检查草稿中**邮箱**、主题、正文是否已填写。"
+
+
+_TO_RE = re.compile(r"\*\*TO:\*\*\s*(.+?)(?:\n|$)")
+_TO_CACHE: dict = {}  # (path, mtime_ns) -> TO 行
+
+
+def _draft_to_line(path: Path) -> str:
+    """草稿的 **TO:** 收件人行（找不到则用文件名）。只读文件头 4KB，按 (路径, mtime) 记忆。"""
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except OSError:
+        return path.stem
+    if key in _TO_CACHE:
+        return _TO_CACHE[key]
+    with path.open("rb") as fh:
+        head = fh.read(4096).decode("utf-8", "replace")
+    to_line = None
+    for line in head.splitlines():
+        if line.startswith("**TO:**") and line[7:].strip():
+            to_line = line[7:].strip()
+            break
+    if to_line is None:
+        m = _TO_RE.search(head)
+        to_line = m.group(1).strip() if m else path.stem
+    _TO_CACHE[key] = to_line
+    return to_line
+
+
+def _parse_allowed() -> frozenset[int]:
+    """TELEGRAM_ALLOWED_CHAT_IDS（逗号或空格分隔）→ chat_id 集合；为空表示不限制。"""
+    ids = set()
+    for x in os.environ.get("TELEGRAM_ALLOWED_CHAT_IDS", "").replace(",", " ").split():
+        try:
+            ids.add(int(x.strip()))
+        except ValueError:
+            pass
+    return frozenset(ids)
+
+
+_ALLOWED_IDS = _parse_allowed()
+
+
+def _auth(chat_id: int | None) -> bool:
+    return not _ALLOWED_IDS or (chat_id is not None and chat_id in _ALLOWED_IDS)
+
+
+_UNAUTH_MSG = "未授权使用此 bot。"
+
+
+# 自由对话的快捷回复：命中则不调用 Gemini。值为字符串直接回复，为函数则调用（在线程里跑）取回复文本
+# 只放问候、致谢、帮助和状态；"ok"/"好"/"y" 这类常是在确认 Agent 的提问，必须交给 Gemini
+_COMMANDS_HINT = ("Available commands: /pending /summary /approve /pipeline_status "
+                  "/followup_check /followup_send /send_batch /mark_replied")
+_CANNED = {
+    "hi": "你好！有什么可以帮你？",
+    "hello": "你好！有什么可以帮你？",
+    "你好": "你好！有什么可以帮你？",
+    "ping": "pong",
+    "thanks": "不客气！",
+    "thank you": "不客气！",
+    "谢谢": "不客气！",
+    "help": _COMMANDS_HINT,
+    "帮助": _COMMANDS_HINT,
+    "status": get_summary_text,
+    "状态": get_summary_text,
+    "简报": get_summary_text,
+}
+
+
+def _canned_key(text: str) -> str:
+    return text.strip().lower().rstrip("?!.。？！")
+
+
+TELEGRAM_MSGS_PER_SEC = 30  # Bot API 全局上限
+TELEGRAM_CHAT_INTERVAL = 1.0  # 同一聊天两条消息的最小间隔（秒）
+CONFIRM_WINDOW = 60         # 两步确认命令（/followup_send、/send_batch）的有效期，秒
+FOLLOWUP_SMTP_WORKERS = 5   # /followup_send 并发 SMTP 连接数（低于邮件服务器连接上限）
+STREAM_EDIT_INTERVAL = 1.0  # 流式回复两次编辑的最小间隔（Telegram 同一聊天约 1 次/秒）
+STREAM_MIN_CHARS = 24       # 至少攒这么多新字符才编辑一次
+_THINKING_MSG = "⏳ 处理中…"  # 自由对话的占位消息，回复生成后原地替换
+
+
+class AsyncRateLimiter:
+    """异步滑动窗口限速：任意 1 秒内最多 per_sec 次 acquire；同一聊天两次之间至少 per_chat_interval 秒。
+    等待时不持锁，一个聊天的排队不会拖慢其它聊天。"""
+
+    def __init__(self, per_sec: int, per_chat_interval: float = 1.0):
+        from collections import deque
+        self.per_sec = per_sec
+        self.per_chat_interval = per_chat_interval
+        self._recent = deque()
+        self._last_sent = {}  # chat_id -> 上次发送时间
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, chat_id=None):
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                while self._recent and now - self._recent[0] >= 1.0:
+                    self._recent.popleft()
+                last = self._last_sent.get(chat_id)
+                wait = 0.0 if chat_id is None or last is None else self.per_chat_interval - (now - last)
+                if len(self._recent) >= self.per_sec:
+                    wait = max(wait, 1.0 - (now - self._recent[0]))
+                if wait <= 0:
+                    self._recent.append(now)
+                    if chat_id is not None:
+                        self._last_sent[chat_id] = now
+                    return
+            await asyncio.sleep(wait)
+
+
+def _retry_seconds(retry_after) -> float:
+    """RetryAfter.retry_after 在新版 python-telegram-bot 中可能是 timedelta。"""
+    return retry_after.total_seconds() if isinstance(retry_after, timedelta) else float(retry_after)
 
 
 def run_polling():
@@ -333,72 +774,91 @@ def run_polling():
     try:
         from telegram import Update
         from telegram.ext import Application, CommandHandler, MessageHandler, ContextTypes, filters
+        from telegram.error import BadRequest, RetryAfter, TelegramError
     except ImportError:
         print("请安装: pip install python-telegram-bot")
         sys.exit(1)
 
-    token = os.environ.get("TELEGRAM_BOT_TOKEN", "").strip().strip('"')
+    token = _env_clean("TELEGRAM_BOT_TOKEN")
     if not token:
         print("请在 .env 中配置 TELEGRAM_BOT_TOKEN（从 @BotFather 获取）。")
         sys.exit(1)
 
-    allowed = os.environ.get("TELEGRAM_ALLOWED_CHAT_IDS", "").strip()
-    allowed_ids = set()
-    for x in allowed.replace(",", " ").split():
+    limiter = AsyncRateLimiter(TELEGRAM_MSGS_PER_SEC, TELEGRAM_CHAT_INTERVAL)
+
+    async def _send(update: Update, text: str):
+        """所有回复统一走这里：全局 + 单聊天限速，遇到 RetryAfter 等待后重试一次。"""
+        chat_id = update.effective_chat.id if update.effective_chat else None
+        await limiter.acquire(chat_id)
         try:
-            allowed_ids.add(int(x.strip()))
-        except ValueError:
-            pass
+            return await update.message.reply_text(text)
+        except RetryAfter as e:
+            await asyncio.sleep(_retry_seconds(e.retry_after) + 0.1)
+            await limiter.acquire(chat_id)
+            return await update.message.reply_text(text)
 
-    def _auth(chat_id) -> bool:
-        return not allowed_ids or (chat_id and chat_id in allowed_ids)
+    async def _edit(message, text: str):
+        """编辑已发出的消息（流式回复用），同样走限速。
+        BadRequest（内容未变除外）只打印并返回 False，由调用方决定是否另发一条。"""
+        await limiter.acquire(message.chat_id)
+        try:
+            await message.edit_text(text)
+        except RetryAfter as e:
+            await asyncio.sleep(_retry_seconds(e.retry_after) + 0.1)
+            await limiter.acquire(message.chat_id)
+            await message.edit_text(text)
+        except BadRequest as e:
+            if "not modified" in str(e).lower():
+                return True
+            print(f"edit_text failed: {e}")
+            return False
+        return True
+
+    def require_auth(handler):
+        """处理函数装饰器：非白名单聊天统一回复 _UNAUTH_MSG（同样走限速），不进入处理逻辑。"""
+        @wraps(handler)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            if not _auth(update.effective_chat.id if update.effective_chat else None):
+                if update.message:
+                    await _send(update, _UNAUTH_MSG)
+                return
+            return await handler(update, context)
+        return wrapper
 
+    @require_auth
     async def cmd_pending(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        if not _auth(update.effective_chat.id if update.effective_chat else None):
-            await update.message.reply_text("未授权使用此 bot。")
-            return
-        drafts = get_pending_drafts()
+        drafts = await asyncio.to_thread(get_pending_drafts)
         if not drafts:
-            await update.message.reply_text("暂无待审批草稿。")
+            await _send(update, "暂无待审批草稿。")
             return
-        lines = [f"📋 待审批 ({len(drafts)}):"] + [f"• {n}" for n, _ in drafts[:20]]
+        lines = [f"📋 待审批 ({len(drafts)}):"] + [f"• {n}" for n, _ in islice(drafts, 20)]
         if len(drafts) > 20:
             lines.append(f"… 共 {len(drafts)} 个")
-        await update.message.reply_text("\n".join(lines))
+        await _send(update, "\n".join(lines))
 
+    @require_auth
     async def cmd_summary(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        if not _auth(update.effective_chat.id if update.effective_chat else None):
-            await update.message.reply_text("未授权使用此 bot。")
-            return
-        await update.message.reply_text(get_summary_text())
+        await _send(update, await asyncio.to_thread(get_summary_text))
 
+    @require_auth
     async def cmd_approve(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        if not _auth(update.effective_chat.id if update.effective_chat else None):
-            await update.message.reply_text("未授权使用此 bot。")
-            return
         name = " ".join(context.args) if context.args else ""
         if not name:
-            await update.message.reply_text("用法: /approve <草稿名或公司名>")
+            await _send(update, "用法: /approve <草稿名或公司名>")
             return
-        msg = approve_and_send(name)
-        await update.message.reply_text(msg)
+        msg = await asyncio.to_thread(approve_and_send, name)
+        await _send(update, msg)
 
+    @require_auth
     async def cmd_pipeline_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        if not _auth(update.effective_chat.id if update.effective_chat else None):
-            await update.message.reply_text("未授权使用此 bot。")
-            return
-        loop = asyncio.get_event_loop()
-        msg = await loop.run_in_executor(None, get_pipeline_status)
-        await update.message.reply_text(msg)
+        msg = await asyncio.to_thread(get_pipeline_status)
+        await _send(update, msg)
 
+    @require_auth
     async def cmd_followup_check(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        if not _auth(update.effective_chat.id if update.effective_chat else None):
-            await update.message.reply_text("未授权使用此 bot。")
-            return
-        loop = asyncio.get_event_loop()
-        due = await loop.run_in_executor(None, get_followup_due)
+        due = await asyncio.to_thread(get_followup_due)
         if not due:
-            await update.message.reply_text("✅ No follow-ups due. Everyone has replied or is still within the 4-day window.")
+            await _send(update, "✅ No follow-ups due. Everyone has replied or is still within the 4-day window.")
             return
         from datetime import datetime as _dt, timezone as _tz, timedelta as _td
         lines = [f"📬 {len(due)} contact(s) due for follow-up:\n"]
@@ -415,59 +875,49 @@ def run_polling():
         if len(due) > 20:
             lines.append(f"... and {len(due) - 20} more")
         lines.append("\nTo send follow-ups: /followup_send\nTo mark someone replied: /mark_replied <email>")
-        await update.message.reply_text("\n".join(lines))
+        await _send(update, "\n".join(lines))
+
+    # 两步确认：(类型, chat_id) -> (登记时间, 载荷)。过期项在下次检查时顺带清理，不再为每次预览起一个 sleep 任务
+    _confirmations: dict[tuple[str, int], tuple[float, object]] = {}
 
-    _pending_followup_send: dict[int, bool] = {}
+    def _arm_confirmation(kind: str, chat_id: int, payload: object = True):
+        _confirmations[(kind, chat_id)] = (time.monotonic(), payload)
 
+    def _take_confirmation(kind: str, chat_id: int):
+        """取出并清除 CONFIRM_WINDOW 秒内登记的确认载荷；没有或已过期返回 None。"""
+        now = time.monotonic()
+        for k, (t, _) in list(_confirmations.items()):
+            if now - t >= CONFIRM_WINDOW:
+                _confirmations.pop(k, None)
+        entry = _confirmations.pop((kind, chat_id), None)
+        return entry[1] if entry else None
+
+
+    @require_auth
     async def cmd_followup_send(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        if not _auth(update.effective_chat.id if update.effective_chat else None):
-            await update.message.reply_text("未授权使用此 bot。")
-            return
         chat_id = update.effective_chat.id if update.effective_chat else 0
-        loop = asyncio.get_event_loop()
-        due = await loop.run_in_executor(None, get_followup_due)
+        due = await asyncio.to_thread(get_followup_due)
         if not due:
-            await update.message.reply_text("No follow-ups due right now.")
+            await _send(update, "No follow-ups due right now.")
             return
 
         # Two-step: first call shows list + asks confirmation, second call (within 60s) sends
-        if not _pending_followup_send.get(chat_id):
-            _pending_followup_send[chat_id] = True
+        if _take_confirmation("followup", chat_id) is None:
+            _arm_confirmation("followup", chat_id)
             lines = [f"⚠️ About to send {len(due)} follow-up email(s) from admin@buildingcodeconsulting.com:\n"]
             for row in due[:15]:
                 lines.append(f"• {row.get('contact_name', '?')} <{row.get('contact_email', '?')}>")
             if len(due) > 15:
                 lines.append(f"... and {len(due) - 15} more")
             lines.append("\nRun /followup_send again within 60 seconds to confirm and send.")
-            await update.message.reply_text("\n".join(lines))
-            # Auto-reset after 60 seconds
-            async def _reset():
-                await asyncio.sleep(60)
-                _pending_followup_send.pop(chat_id, None)
-            asyncio.create_task(_reset())
+            await _send(update, "\n".join(lines))
         else:
-            _pending_followup_send.pop(chat_id, None)
-            await update.message.reply_text(f"📤 Sending {len(due)} follow-up(s)...")
-            from email_sender import send_from_admin
+            await _send(update, f"📤 Sending {len(due)} follow-up(s)...")
+            from email_sender import send_from_admin_batch
             from datetime import datetime as _dt, timezone as _tz
-            import csv as _csv
             sent_count = 0
-            log_path = BASE_DIR / "sent_log.csv"
-            rows_all = []
-            fieldnames = None
-            with open(log_path, newline="", encoding="utf-8") as f:
-                reader = _csv.DictReader(f)
-                fieldnames = list(reader.fieldnames or [])
-                rows_all = list(reader)
-            for col in ("replied", "followup_sent_at"):
-                if col not in fieldnames:
-                    fieldnames.append(col)
-            sent_emails = {r.get("contact_email", "").lower() for r in due}
-            for row in rows_all:
-                if row.get("contact_email", "").lower() not in sent_emails:
-                    continue
-                if row.get("followup_sent_at", "").strip():
-                    continue
+            items = []
+            for row in due:
                 name = row.get("contact_name", "")
                 first = name.split()[0] if name else "there"
                 project = row.get("project", "") or row.get("subject", "")
@@ -476,25 +926,20 @@ def run_polling():
                         + ". I understand you're busy — just wanted to make sure this didn't get lost.\n\n"
                         "If you have any questions or would like to set up a quick call, "
                         "I'm happy to make time. Looking forward to connecting.")
-                ok, _ = await loop.run_in_executor(
-                    None, lambda r=row, b=body: send_from_admin(r["contact_email"], f"Re: {r.get('subject', '')}", b)
-                )
+                items.append((row["contact_email"], f"Re: {row.get('subject', '')}", body))
+            # 最多 FOLLOWUP_SMTP_WORKERS 条并发 SMTP 连接，每条连接只握手 + 登录一次
+            results = await asyncio.to_thread(send_from_admin_batch, items, FOLLOWUP_SMTP_WORKERS)
+            stamps = {}
+            for row, (ok, _) in zip(due, results):
                 if ok:
-                    row["followup_sent_at"] = _dt.now(_tz.utc).isoformat()
+                    stamps[_followup_key(row["contact_email"], row.get("sent_at", ""))] = _dt.now(_tz.utc).isoformat()
                     sent_count += 1
-            with open(log_path, "w", newline="", encoding="utf-8") as f:
-                w = _csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-                w.writeheader()
-                w.writerows(rows_all)
-            await update.message.reply_text(f"✅ Sent {sent_count}/{len(due)} follow-up(s). sent_log updated.")
-
-    _pending_send_batch: dict[int, list] = {}
+            await asyncio.to_thread(write_followup_stamps, stamps)
+            await _send(update, f"✅ Sent {sent_count}/{len(due)} follow-up(s). sent_log updated.")
 
+    @require_auth
     async def cmd_send_batch(update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Send top N CW drafts from Outbound/. Two-step confirm."""
-        if not _auth(update.effective_chat.id if update.effective_chat else None):
-            await update.message.reply_text("未授权使用此 bot。")
-            return
         chat_id = update.effective_chat.id if update.effective_chat else 0
         try:
             n = int(context.args[0]) if context.args else 10
@@ -503,72 +948,82 @@ def run_polling():
         outbound = BASE_DIR / "Pending_Approval" / "Outbound"
         drafts = sorted(outbound.glob("CW_*.md"))[:n]
         if not drafts:
-            await update.message.reply_text("No CW drafts found in Outbound/. Run the pipeline first.")
+            await _send(update, "No CW drafts found in Outbound/. Run the pipeline first.")
             return
-        if not _pending_send_batch.get(chat_id):
-            _pending_send_batch[chat_id] = drafts
+        confirmed_drafts = _take_confirmation("send_batch", chat_id)
+        if confirmed_drafts is None:
+            _arm_confirmation("send_batch", chat_id, drafts)
             lines = [f"⚠️ About to send {len(drafts)} draft(s) from admin@:\n"]
-            import re as _re
-            for d in drafts[:15]:
-                to_m = _re.search(r"\*\*TO:\*\*\s*(.+?)(?:\n|$)", d.read_text(encoding="utf-8"))
-                to_line = to_m.group(1).strip() if to_m else d.stem
-                lines.append(f"• {to_line}")
+            for d in islice(drafts, 15):
+                lines.append(f"• {_draft_to_line(d)}")
             if len(drafts) > 15:
                 lines.append(f"... and {len(drafts) - 15} more")
             lines.append(f"\nRun /send_batch {n} again within 60s to confirm.")
-            await update.message.reply_text("\n".join(lines))
-            async def _reset_batch():
-                await asyncio.sleep(60)
-                _pending_send_batch.pop(chat_id, None)
-            asyncio.create_task(_reset_batch())
+            await _send(update, "\n".join(lines))
         else:
-            confirmed_drafts = _pending_send_batch.pop(chat_id)
-            await update.message.reply_text(f"📤 Sending {len(confirmed_drafts)} email(s)...")
-            import subprocess
-            loop = asyncio.get_event_loop()
+            await _send(update, f"📤 Sending {len(confirmed_drafts)} email(s)...")
             # Build file filter from draft names
             names = ",".join(d.stem for d in confirmed_drafts)
-            result = await loop.run_in_executor(
-                None,
-                lambda: subprocess.run(
-                    ["python", "send_cw_outreach.py", "--all", "--files", names],
-                    capture_output=True, text=True,
-                    cwd=str(BASE_DIR)
-                )
+            # 子进程输出逐行读取，每 10 行回传一次进度（PYTHONUNBUFFERED 让 print 立即到达管道；
+            # PYTHONIOENCODING 固定 UTF-8，否则 Windows 下管道按 cp936/cp1252 编码，“§”“—”会乱码）
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, "send_cw_outreach.py", "--all", "--files", names,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+                cwd=str(BASE_DIR),
+                env={**os.environ, "PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8"},
             )
-            out = (result.stdout or "") + (result.stderr or "")
-            await update.message.reply_text(f"Result:\n{out[:3000]}")
+            buf = []
+            relay = True  # 转发出错后不再发进度，但子进程输出照常读完
+
+            async def _flush():
+                nonlocal relay
+                text = "".join(buf)
+                buf.clear()
+                if not relay or not text.strip():
+                    return  # Telegram 拒收空白消息
+                try:
+                    for i in range(0, len(text), MAX_TELEGRAM_MESSAGE):
+                        await _send(update, text[i:i + MAX_TELEGRAM_MESSAGE])
+                except TelegramError as e:
+                    print(f"send_batch progress relay failed: {e}")
+                    relay = False
 
+            try:
+                async for line in proc.stdout:
+                    buf.append(line.decode("utf-8", "replace"))
+                    if len(buf) >= 10:
+                        await _flush()
+                if buf:
+                    await _flush()
+            finally:
+                # 任何情况下（包括 handler 被取消）都读完剩余输出并等子进程退出，
+                # 否则管道写满后 send_cw_outreach.py 会卡在发送中途
+                await proc.communicate()
+            rc = proc.returncode
+            await _send(update, f"{'✅' if rc == 0 else '❌'} send_cw_outreach.py exited with code {rc}.")
+
+    @require_auth
     async def cmd_mark_replied(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        if not _auth(update.effective_chat.id if update.effective_chat else None):
-            await update.message.reply_text("未授权使用此 bot。")
-            return
         email = " ".join(context.args).strip() if context.args else ""
         if not email or "@" not in email:
-            await update.message.reply_text("Usage: /mark_replied <email@domain.com>")
+            await _send(update, "Usage: /mark_replied <email@domain.com>")
             return
-        loop = asyncio.get_event_loop()
-        count, msg = await loop.run_in_executor(None, lambda: mark_contact_replied(email))
-        await update.message.reply_text(msg)
+        count, msg = await asyncio.to_thread(mark_contact_replied, email)
+        await _send(update, msg)
 
     # ── Call tracking ──────────────────────────────────────────────────────────
+    @require_auth
     async def cmd_call_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Show contacts due for a call today."""
-        if not _auth(update.effective_chat.id if update.effective_chat else None):
-            await update.message.reply_text("未授权使用此 bot。")
-            return
         show_all = bool(context.args and context.args[0].lower() in ("all", "--all"))
-        loop = asyncio.get_event_loop()
-        msg = await loop.run_in_executor(None, lambda: get_call_list_text(show_all=show_all))
-        await update.message.reply_text(msg[:4000])
+        msg = await asyncio.to_thread(get_call_list_text, show_all=show_all)
+        await _send(update, msg[:4000])
 
+    @require_auth
     async def cmd_call_no_answer(update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Mark no answer, schedule callback in 2 days (or N if specified)."""
-        if not _auth(update.effective_chat.id if update.effective_chat else None):
-            await update.message.reply_text("未授权使用此 bot。")
-            return
         if not context.args:
-            await update.message.reply_text("Usage: /call_no_answer <email> [days]\nDefault: 2 days until next call")
+            await _send(update, "Usage: /call_no_answer <email> [days]\nDefault: 2 days until next call")
             return
         email = context.args[0].strip()
         days = 2
@@ -578,73 +1033,97 @@ def run_polling():
             except ValueError:
                 pass
         if "@" not in email:
-            await update.message.reply_text("Please provide a valid email address.")
+            await _send(update, "Please provide a valid email address.")
             return
-        loop = asyncio.get_event_loop()
-        msg = await loop.run_in_executor(None, lambda: update_phone_status(email, "no_answer", days=days))
-        await update.message.reply_text(msg)
+        msg = await asyncio.to_thread(update_phone_status, email, "no_answer", days=days)
+        await _send(update, msg)
 
+    @require_auth
     async def cmd_call_declined(update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Mark contact as declined — stop contacting for this project."""
-        if not _auth(update.effective_chat.id if update.effective_chat else None):
-            await update.message.reply_text("未授权使用此 bot。")
-            return
         if not context.args:
-            await update.message.reply_text("Usage: /call_declined <email> [notes]")
+            await _send(update, "Usage: /call_declined <email> [notes]")
             return
         email = context.args[0].strip()
         notes = " ".join(context.args[1:]) if len(context.args) > 1 else ""
         if "@" not in email:
-            await update.message.reply_text("Please provide a valid email address.")
+            await _send(update, "Please provide a valid email address.")
             return
-        loop = asyncio.get_event_loop()
-        msg = await loop.run_in_executor(None, lambda: update_phone_status(email, "declined", notes=notes))
-        await update.message.reply_text(msg)
+        msg = await asyncio.to_thread(update_phone_status, email, "declined", notes=notes)
+        await _send(update, msg)
 
+    @require_auth
     async def cmd_call_connected(update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Mark contact as connected (you spoke to them)."""
-        if not _auth(update.effective_chat.id if update.effective_chat else None):
-            await update.message.reply_text("未授权使用此 bot。")
-            return
         if not context.args:
-            await update.message.reply_text("Usage: /call_connected <email> [notes]")
+            await _send(update, "Usage: /call_connected <email> [notes]")
             return
         email = context.args[0].strip()
         notes = " ".join(context.args[1:]) if len(context.args) > 1 else ""
         if "@" not in email:
-            await update.message.reply_text("Please provide a valid email address.")
+            await _send(update, "Please provide a valid email address.")
             return
-        loop = asyncio.get_event_loop()
-        msg = await loop.run_in_executor(None, lambda: update_phone_status(email, "connected", notes=notes))
-        await update.message.reply_text(msg)
+        msg = await asyncio.to_thread(update_phone_status, email, "connected", notes=notes)
+        await _send(update, msg)
 
+    @require_auth
     async def handle_chat(update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Free-text Gemini chat."""
         if not update.message or not update.message.text:
             return
-        chat_id = update.effective_chat.id if update.effective_chat else None
-        if not _auth(chat_id):
-            await update.message.reply_text("未授权使用此 bot。")
-            return
         user_text = update.message.text.strip()
         if not user_text:
             return
+        canned = _CANNED.get(_canned_key(user_text))
+        if canned is not None:
+            await _send(update, await asyncio.to_thread(canned) if callable(canned) else canned)
+            return
+        if not any(ch.isalnum() for ch in user_text):  # 只拦纯标点/表情；"ok"、"y"、进度 这类短句照常交给 Gemini
+            await _send(update, "请多说几句，或直接用命令。\n" + _COMMANDS_HINT)
+            return
         if not GEMINI_API_KEY:
-            await update.message.reply_text(
-                "Free-text chat requires GEMINI_API_KEY in .env.\n"
-                "Available commands: /pending /summary /approve /pipeline_status "
-                "/followup_check /followup_send /send_batch /mark_replied"
-            )
+            await _send(update, "Free-text chat requires GEMINI_API_KEY in .env.\n" + _COMMANDS_HINT)
             return
-        await update.message.reply_chat_action("typing")
-        ctx = get_agent_context()
-        loop = asyncio.get_event_loop()
-        reply = await loop.run_in_executor(None, lambda: call_gemini_agent(user_text, ctx))
-        if not reply:
-            reply = "No reply from model — please try again."
-        if len(reply) > MAX_TELEGRAM_MESSAGE:
-            reply = reply[: MAX_TELEGRAM_MESSAGE - 20] + "\n…(truncated)"
-        await update.message.reply_text(reply)
+        # 先发占位消息代替 typing 动作（不会过期，也少一次 API 调用），之后所有输出都编辑这一条
+        shown = _THINKING_MSG
+        sent = await _send(update, shown)
+        ctx = await asyncio.to_thread(get_agent_context)
+        # 边生成边显示：攒够 STREAM_MIN_CHARS 个新字符且距上次编辑 ≥ STREAM_EDIT_INTERVAL 秒，就更新消息
+        # live：是否还在中途更新。已显示截断后的全文、或编辑本身出错（网络等）后就只等最终那一次编辑；
+        # 编辑失败不算 Agent 出错，下面的 except 只针对 Gemini 流
+        text = ""
+        shown_len = 0  # 已显示的回复字符数（占位消息不算）
+        live = True
+        last_edit = time.monotonic()
+        try:
+            async for piece in stream_gemini_agent(user_text, ctx):
+                text += piece
+                now = time.monotonic()
+                if live and len(text) - shown_len >= STREAM_MIN_CHARS and now - last_edit >= STREAM_EDIT_INTERVAL:
+                    clipped = _clip_reply(text)
+                    live = len(text) <= MAX_TELEGRAM_MESSAGE
+                    last_edit = now
+                    try:
+                        edited = await _edit(sent, clipped)
+                    except TelegramError as e:
+                        print(f"edit_text failed: {e}")
+                        edited = False
+                    if edited:
+                        shown, shown_len = clipped, len(text)
+                    else:
+                        live = False
+        except Exception as e:
+            text = f"{text}\n\nAgent 调用出错: {e}" if text else f"Agent 调用出错: {e}"
+        final = _clip_reply(text.strip() or _NO_MODEL_MSG)
+        if final != shown:
+            try:
+                edited = await _edit(sent, final)
+            except TelegramError as e:
+                print(f"edit_text failed: {e}")
+                edited = False
+            if not edited:
+                # 占位消息改不动（网络、被删等）：另发一条，不让用户只看到“处理中”
+                await _send(update, final)
 
     start_text = (
         "BCC Sales Automation Bot\n\n"
@@ -668,7 +1147,7 @@ def run_polling():
     )
 
     async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        await update.message.reply_text(start_text)
+        await _send(update, start_text)
 
     app = Application.builder().token(token).build()
     app.add_handler(CommandHandler("pending",         cmd_pending))